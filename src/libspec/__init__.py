@@ -18,14 +18,35 @@ Usage:
 
     # Validate with structured errors
     issues = validate_spec("path/to/libspec.json", structured=True)
+
+    # Pass/fail check without collecting errors
+    ok = is_valid_spec("path/to/libspec.json")
+
+    # Validate many files, reusing compiled validators
+    for path, issues in validate_specs(paths):
+        ...
 """
 
-from copy import deepcopy
+import copy
+import json
+from collections.abc import Iterable, Iterator, Sequence
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
 from importlib.resources import files
 from pathlib import Path
-from typing import Any, Union
+from typing import TYPE_CHECKING, Any, Union
+
+if TYPE_CHECKING:
+    from jsonschema import Draft202012Validator
+    from pydantic import ValidationError
+
+    from libspec.models.core import LibspecSpec
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None  # type: ignore[assignment]
 
 __version__ = "0.1.0"
 
@@ -47,7 +68,7 @@ class ValidationSource(str, Enum):
     PYDANTIC = "pydantic"
 
 
-@dataclass
+@dataclass(slots=True)
 class ValidationIssue:
     """Structured validation issue with context."""
 
@@ -86,6 +107,24 @@ CONCERN_EXTENSIONS = frozenset([
 
 ALL_EXTENSIONS = DOMAIN_EXTENSIONS | CONCERN_EXTENSIONS
 
+# Sorted once for error messages
+_ALL_EXTENSIONS_SORTED = tuple(sorted(ALL_EXTENSIONS))
+
+
+# Packaged schema directory, resolved once at import
+_SCHEMA_ROOT = files("libspec") / "schema"
+# Schema paths already confirmed to exist, keyed by schema name
+_SCHEMA_PATH_CACHE: dict[str, Path] = {}
+
+
+def _load_json(path: Path) -> Any:
+    """Parse a JSON file, using orjson when it is installed."""
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
 
 def get_schema_path(schema_name: str = "core.schema.json") -> Path:
     """
@@ -101,13 +140,36 @@ def get_schema_path(schema_name: str = "core.schema.json") -> Path:
     Raises:
         FileNotFoundError: If the schema file doesn't exist
     """
-    schema_dir = files("libspec") / "schema"
-    schema_path = Path(str(schema_dir / schema_name))
-    if not schema_path.exists():
-        raise FileNotFoundError(f"Schema not found: {schema_name}")
+    schema_path = _SCHEMA_PATH_CACHE.get(schema_name)
+    if schema_path is None:
+        schema_path = Path(str(_SCHEMA_ROOT / schema_name))
+        if not schema_path.exists():
+            raise FileNotFoundError(f"Schema not found: {schema_name}")
+        _SCHEMA_PATH_CACHE[schema_name] = schema_path
     return schema_path
 
 
+@lru_cache(maxsize=None)
+def _core_schema() -> dict[str, Any]:
+    """Load the core schema once per process. The result is shared; never mutate it."""
+    result: dict[str, Any] = _load_json(get_schema_path("core.schema.json"))
+    return result
+
+
+@lru_cache(maxsize=32)
+def _extension_schema(extension_name: str) -> dict[str, Any]:
+    """Load an extension schema once per process. The result is shared; never mutate it."""
+    if extension_name not in ALL_EXTENSIONS:
+        raise ValueError(
+            f"Unknown extension: {extension_name!r}. "
+            f"Valid extensions: {list(_ALL_EXTENSIONS_SORTED)}"
+        )
+
+    schema_path = get_schema_path(f"extensions/{extension_name}.schema.json")
+    result: dict[str, Any] = _load_json(schema_path)
+    return result
+
+
 def get_core_schema() -> dict[str, Any]:
     """
     Load and return the core schema as a dictionary.
@@ -115,12 +177,7 @@ def get_core_schema() -> dict[str, Any]:
     Returns:
         The core JSON Schema as a dict
     """
-    import json
-
-    schema_path = get_schema_path("core.schema.json")
-    with open(schema_path) as f:
-        result: dict[str, Any] = json.load(f)
-        return result
+    return copy.deepcopy(_core_schema())
 
 
 def get_extension_schema(extension_name: str) -> dict[str, Any]:
@@ -137,18 +194,7 @@ def get_extension_schema(extension_name: str) -> dict[str, Any]:
         ValueError: If the extension name is not recognized
         FileNotFoundError: If the extension schema file doesn't exist
     """
-    import json
-
-    if extension_name not in ALL_EXTENSIONS:
-        raise ValueError(
-            f"Unknown extension: {extension_name!r}. "
-            f"Valid extensions: {sorted(ALL_EXTENSIONS)}"
-        )
-
-    schema_path = get_schema_path(f"extensions/{extension_name}.schema.json")
-    with open(schema_path) as f:
-        result: dict[str, Any] = json.load(f)
-        return result
+    return copy.deepcopy(_extension_schema(extension_name))
 
 
 def merge_schemas(
@@ -157,8 +203,10 @@ def merge_schemas(
     """
     Merge core schema with extension schemas.
 
-    This performs a deep merge of $defs from each extension schema into
-    the core schema, allowing validation of extension-specific fields.
+    This merges $defs from each extension schema into the core schema,
+    allowing validation of extension-specific fields. Only the top-level
+    dict and its $defs mapping are copied; nested schemas are shared with
+    the inputs, which are never modified.
 
     Args:
         core_schema: The core libspec schema
@@ -168,13 +216,11 @@ def merge_schemas(
         Tuple of (merged_schema, warnings) where warnings contains any
         issues encountered during merging (e.g., unknown extensions)
     """
-    merged = deepcopy(core_schema)
+    # Only $defs is written to, so it is the only container that needs copying
+    merged_defs: dict[str, Any] = dict(core_schema.get("$defs", {}))
+    merged = {**core_schema, "$defs": merged_defs}
     warnings: list[ValidationIssue] = []
 
-    # Ensure $defs exists
-    if "$defs" not in merged:
-        merged["$defs"] = {}
-
     for ext_name in extension_names:
         if ext_name not in ALL_EXTENSIONS:
             warnings.append(
@@ -182,13 +228,13 @@ def merge_schemas(
                     message=f"Unknown extension: {ext_name!r}",
                     path="$.extensions",
                     severity=ValidationSeverity.WARNING,
-                    context={"extension": ext_name, "valid": sorted(ALL_EXTENSIONS)},
+                    context={"extension": ext_name, "valid": list(_ALL_EXTENSIONS_SORTED)},
                 )
             )
             continue
 
         try:
-            ext_schema = get_extension_schema(ext_name)
+            ext_schema = _extension_schema(ext_name)
         except FileNotFoundError:
             warnings.append(
                 ValidationIssue(
@@ -200,100 +246,213 @@ def merge_schemas(
             )
             continue
 
-        # Merge $defs from extension into core
-        if "$defs" in ext_schema:
-            for def_name, def_schema in ext_schema["$defs"].items():
-                if def_name in merged["$defs"]:
-                    # Skip if already defined (core takes precedence)
-                    continue
-                merged["$defs"][def_name] = def_schema
+        # Merge $defs from extension into core. Names already defined are
+        # skipped, so core (then earlier extensions) takes precedence.
+        ext_defs = ext_schema.get("$defs")
+        if ext_defs:
+            merged_defs.update(
+                {name: schema for name, schema in ext_defs.items() if name not in merged_defs}
+            )
 
     return merged, warnings
 
 
-def validate_spec(
-    spec_path: Union[str, Path],
-    *,
-    structured: bool = False,
-) -> Union[list[str], list[ValidationIssue]]:
-    """
-    Validate a libspec specification file against the schema.
+# Compiled validators keyed by the spec's extension list. Order is part of the
+# key because earlier extensions win when two of them define the same $def.
+_VALIDATOR_CACHE: dict[tuple[str, ...], tuple["Draft202012Validator", list[ValidationIssue]]] = {}
 
-    Automatically detects and merges extension schemas based on the
-    "extensions" field in the spec.
+
+def _get_validator(
+    extensions: tuple[str, ...],
+) -> tuple["Draft202012Validator", list[ValidationIssue]]:
+    """
+    Get a compiled validator for the core schema merged with extensions.
 
     Args:
-        spec_path: Path to the specification file to validate
-        structured: If True, return ValidationIssue objects instead of strings
+        extensions: Extension names declared by the spec
 
     Returns:
-        List of validation errors (empty if valid). If structured=True,
-        returns ValidationIssue objects with full context.
+        Tuple of (validator, merge_warnings). Both are cached per process.
     """
-    import json
+    cached = _VALIDATOR_CACHE.get(extensions)
+    if cached is None:
+        from jsonschema import Draft202012Validator
 
-    from jsonschema import Draft202012Validator
+        schema = _core_schema()
+        merge_warnings: list[ValidationIssue] = []
+        if extensions:
+            schema, merge_warnings = merge_schemas(schema, list(extensions))
+        cached = (Draft202012Validator(schema), merge_warnings)
+        _VALIDATOR_CACHE[extensions] = cached
+    return cached
+
+
+def _format_path(parts: Iterable[str | int]) -> str:
+    """Format a JSON Schema path or Pydantic loc as a JSONPath-like string."""
+    return "$" + "".join(f"[{p}]" if isinstance(p, int) else f"[{p!r}]" for p in parts)
+
+
+@lru_cache(maxsize=None)
+def _spec_model() -> tuple[type["LibspecSpec"], type["ValidationError"]]:
+    """
+    Import the Pydantic spec model on first use.
 
-    spec_path = Path(spec_path)
-    with open(spec_path) as f:
-        spec = json.load(f)
+    Pydantic and the models are kept out of ``import libspec`` so that
+    schema-only callers stay cheap; this resolves them once per process.
+    """
+    from pydantic import ValidationError
+
+    from libspec.models.core import LibspecSpec
 
-    # Start with core schema
-    schema = get_core_schema()
-    issues: list[ValidationIssue] = []
+    return LibspecSpec, ValidationError
 
-    # Merge extension schemas based on spec["extensions"]
-    extensions = spec.get("extensions", [])
-    if extensions:
-        schema, merge_warnings = merge_schemas(schema, extensions)
-        issues.extend(merge_warnings)
+
+def _collect_issues(
+    spec: Any,
+    extensions: tuple[str, ...],
+    *,
+    with_paths: bool,
+    skip_pydantic: bool,
+) -> list[ValidationIssue]:
+    """
+    Run JSON Schema and Pydantic validation over parsed spec data.
+
+    Args:
+        spec: Parsed spec JSON
+        extensions: Extension schemas to merge into the core schema
+        with_paths: If False, skip formatting issue paths (callers that
+            only report messages don't need them)
+        skip_pydantic: If True, only run JSON Schema validation
+
+    Returns:
+        Merge warnings followed by validation errors
+    """
+    validator, merge_warnings = _get_validator(extensions)
+    issues: list[ValidationIssue] = list(merge_warnings)
 
     # Validate with JSON Schema
-    validator = Draft202012Validator(schema)
     for error in validator.iter_errors(spec):
-        path = "$" + "".join(
-            f"[{p!r}]" if isinstance(p, str) else f"[{p}]" for p in error.absolute_path
-        )
         issues.append(
             ValidationIssue(
                 message=error.message,
-                path=path,
+                path=_format_path(error.absolute_path) if with_paths else "$",
                 severity=ValidationSeverity.ERROR,
-                schema_path=error.json_path if hasattr(error, "json_path") else None,
+                schema_path=(
+                    error.json_path if with_paths and hasattr(error, "json_path") else None
+                ),
                 source=ValidationSource.JSON_SCHEMA,
             )
         )
 
     # Also validate with Pydantic to catch model validators
     # Only run if JSON Schema validation passed (to avoid duplicate errors)
-    if not any(issue.severity == ValidationSeverity.ERROR for issue in issues):
-        from pydantic import ValidationError
-
-        from libspec.models.core import LibspecSpec
-
+    if not skip_pydantic and not any(
+        issue.severity == ValidationSeverity.ERROR for issue in issues
+    ):
+        LibspecSpec, ValidationError = _spec_model()
         try:
             LibspecSpec.model_validate(spec)
         except ValidationError as e:
             for err in e.errors():
-                # Format the path from Pydantic's loc tuple
-                loc_parts = []
-                for part in err["loc"]:
-                    if isinstance(part, int):
-                        loc_parts.append(f"[{part}]")
-                    else:
-                        loc_parts.append(f"[{part!r}]")
-                path = "$" + "".join(loc_parts)
-
                 issues.append(
                     ValidationIssue(
                         message=err["msg"],
-                        path=path,
+                        path=_format_path(err["loc"]) if with_paths else "$",
                         severity=ValidationSeverity.ERROR,
                         source=ValidationSource.PYDANTIC,
                         context={"type": err["type"]},
                     )
                 )
 
+    return issues
+
+
+def validate_spec(
+    spec_path: Union[str, Path],
+    *,
+    structured: bool = False,
+    skip_pydantic: bool = False,
+) -> Union[list[str], list[ValidationIssue]]:
+    """
+    Validate a libspec specification file against the schema.
+
+    Automatically detects and merges extension schemas based on the
+    "extensions" field in the spec.
+
+    Args:
+        spec_path: Path to the specification file to validate
+        structured: If True, return ValidationIssue objects instead of strings
+        skip_pydantic: If True, only run JSON Schema validation. Use when the
+            spec has already been parsed with the Pydantic models (e.g., by
+            the CLI spec loader), since model validators would run twice.
+
+    Returns:
+        List of validation errors (empty if valid). If structured=True,
+        returns ValidationIssue objects with full context.
+    """
+    spec = _load_json(Path(spec_path))
+    issues = _collect_issues(
+        spec,
+        tuple(spec.get("extensions") or ()),
+        with_paths=structured,
+        skip_pydantic=skip_pydantic,
+    )
+
     if structured:
         return issues
     return [issue.message for issue in issues if issue.severity == ValidationSeverity.ERROR]
+
+
+def is_valid_spec(spec_path: Union[str, Path]) -> bool:
+    """
+    Check whether a libspec specification file is valid.
+
+    Runs the same JSON Schema and Pydantic checks as validate_spec(), but
+    stops at the first error instead of collecting every issue. Use this
+    when only a pass/fail answer is needed.
+
+    Args:
+        spec_path: Path to the specification file to validate
+
+    Returns:
+        True if the spec has no validation errors
+    """
+    spec = _load_json(Path(spec_path))
+    validator, _ = _get_validator(tuple(spec.get("extensions") or ()))
+    if not validator.is_valid(spec):
+        return False
+
+    LibspecSpec, ValidationError = _spec_model()
+    try:
+        LibspecSpec.model_validate(spec)
+    except ValidationError:
+        return False
+    return True
+
+
+def validate_specs(
+    spec_paths: Iterable[Union[str, Path]],
+    extensions: Sequence[str] | None = None,
+) -> Iterator[tuple[Path, list[ValidationIssue]]]:
+    """
+    Validate several libspec specification files.
+
+    Results are yielded as each file is checked, so callers can report
+    progress while a large batch runs. Compiled validators are shared
+    between files that use the same extensions.
+
+    Args:
+        spec_paths: Paths to the specification files to validate
+        extensions: Extensions to merge for every file. If None, each
+            file's own "extensions" field is used.
+
+    Yields:
+        Tuples of (path, issues) with the same issues that
+        validate_spec(path, structured=True) returns
+    """
+    forced = tuple(extensions) if extensions is not None else None
+    for spec_path in spec_paths:
+        path = Path(spec_path)
+        spec = _load_json(path)
+        exts = forced if forced is not None else tuple(spec.get("extensions") or ())
+        yield path, _collect_issues(spec, exts, with_paths=True, skip_pydantic=False)
@@ -25,19 +25,30 @@ class Context:
         self.config = config
         self.strict_models = strict_models
         self._spec: LoadedSpec | None = None
+        self._spec_file: Path | None = None
+        self._spec_mtime: int | None = None
 
     def get_spec(self) -> LoadedSpec:
-        """Get the loaded spec, loading it if needed."""
-        if self._spec is None:
-            path = find_spec_file(self.spec_path, self.config)
-            if path is None:
+        """Get the loaded spec, reloading it only if the file has changed."""
+        if self._spec_file is None:
+            self._spec_file = find_spec_file(self.spec_path, self.config)
+            if self._spec_file is None:
                 raise click.ClickException(
                     "No spec file found. Use --spec or set spec_path in [tool.libspec]"
                 )
+        path = self._spec_file
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            raise click.ClickException(f"Spec file not found: {path}")
+        except OSError as e:
+            raise click.ClickException(f"Cannot read {path}: {e}")
+        if self._spec is None or mtime != self._spec_mtime:
             try:
                 self._spec = load_spec(path, strict=self.strict_models)
             except SpecLoadError as e:
                 raise click.ClickException(str(e))
+            self._spec_mtime = mtime
         return self._spec
 
 
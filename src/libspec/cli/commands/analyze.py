@@ -1,7 +1,9 @@
 """Analyze commands: coverage, deps, surface."""
 
 import re
-from collections import defaultdict
+from collections import Counter, defaultdict
+from collections.abc import Set
+from itertools import chain
 from typing import Any
 
 import click
@@ -10,33 +12,59 @@ from libspec.cli.app import Context, pass_context
 from libspec.cli.output import make_envelope, output_json
 from libspec.models import TypeDef
 
+# Candidate type names inside annotations and signatures
+_TYPE_REF_RE = re.compile(r"[A-Z][a-zA-Z0-9]*")
 
-def extract_refs_from_type(type_def: TypeDef) -> set[str]:
-    """Extract type references from a type definition."""
-    refs = set()
+
+def extract_refs_from_type(
+    type_def: TypeDef, type_names: Set[str] | None = None
+) -> set[str]:
+    """
+    Extract type references from a type definition.
+
+    Args:
+        type_def: The type to scan
+        type_names: If given, only names in this set are collected
+
+    Returns:
+        Set of referenced type names
+    """
+    refs: set[str] = set()
 
     # Bases
     for base in type_def.bases:
         if not base.startswith(("#", "typing.", "collections.")):
-            refs.add(base)
+            if type_names is None or base in type_names:
+                refs.add(base)
 
     # Related
     for ref in type_def.related:
         if ref.startswith("#/types/"):
-            refs.add(ref.split("/")[-1])
+            name = ref.split("/")[-1]
+            if type_names is None or name in type_names:
+                refs.add(name)
 
     # Properties types
     for prop in type_def.properties:
-        ptype = prop.type or ""
+        ptype = prop.type
+        # Annotations without capitals (str, list[int], ...) can't name a type
+        if not ptype or ptype.islower():
+            continue
         # Extract type names from type annotations
-        for match in re.findall(r"[A-Z][a-zA-Z0-9]*", ptype):
-            refs.add(match)
+        if type_names is None:
+            refs.update(_TYPE_REF_RE.findall(ptype))
+        else:
+            refs.update(m for m in _TYPE_REF_RE.findall(ptype) if m in type_names)
 
     # Method signatures
     for method in type_def.methods:
         sig = method.signature
-        for match in re.findall(r"[A-Z][a-zA-Z0-9]*", sig):
-            refs.add(match)
+        if sig.islower():
+            continue
+        if type_names is None:
+            refs.update(_TYPE_REF_RE.findall(sig))
+        else:
+            refs.update(m for m in _TYPE_REF_RE.findall(sig) if m in type_names)
 
     return refs
 
@@ -77,43 +105,58 @@ def coverage(ctx: Context, coverage_type: str, threshold: float | None) -> None:
     if coverage_type in ("features", "all"):
         features = spec.features
         total = len(features)
-        planned = sum(1 for f in features if f.status == "planned")
-        implemented = sum(1 for f in features if f.status == "implemented")
-        tested = sum(1 for f in features if f.status == "tested")
+        planned = 0
+        implemented = 0
+        tested = 0
 
-        result["features"] = {
-            "total": total,
-            "planned": planned,
-            "implemented": implemented,
-            "tested": tested,
-            "coverage_pct": round((implemented + tested) / total * 100, 1) if total else 0,
-        }
-
-        # Find gaps
+        # Count statuses and collect gaps in a single pass
         for f in features:
-            if f.status == "planned":
+            status = f.status
+            if status == "planned":
+                planned += 1
                 gaps.append({
                     "entity": "feature",
                     "id": f.id,
                     "issue": "not implemented",
                 })
-            elif f.status == "implemented":
+            elif status == "implemented":
+                implemented += 1
                 gaps.append({
                     "entity": "feature",
                     "id": f.id,
                     "issue": "not tested",
                 })
+            elif status == "tested":
+                tested += 1
+
+        result["features"] = {
+            "total": total,
+            "planned": planned,
+            "implemented": implemented,
+            "tested": tested,
+            "coverage_pct": round((implemented + tested) / total * 100, 1) if total else 0,
+        }
 
     if coverage_type in ("docs", "all"):
         types = spec.types
         types_total = len(types)
-        types_documented = sum(1 for t in types if t.docstring)
-
+        types_documented = 0
         methods_total = 0
         methods_documented = 0
+
+        # Count documentation and collect gaps in a single pass
         for t in types:
-            for m in t.methods:
-                methods_total += 1
+            if t.docstring:
+                types_documented += 1
+            else:
+                gaps.append({
+                    "entity": "type",
+                    "name": t.name,
+                    "issue": "no docstring",
+                })
+            methods = t.methods
+            methods_total += len(methods)
+            for m in methods:
                 if m.description:
                     methods_documented += 1
 
@@ -132,15 +175,6 @@ def coverage(ctx: Context, coverage_type: str, threshold: float | None) -> None:
             else 0,
         }
 
-        # Find gaps
-        for t in types:
-            if not t.docstring:
-                gaps.append({
-                    "entity": "type",
-                    "name": t.name,
-                    "issue": "no docstring",
-                })
-
     result["gaps"] = gaps
 
     if ctx.text:
@@ -205,14 +239,19 @@ def deps(
     spec = ctx.get_spec()
 
     # Build type dependency graph
+    types = spec.types
     type_deps: dict[str, set[str]] = defaultdict(set)
-    type_names = {t.name for t in spec.types}
+    type_names = frozenset(t.name for t in types)
 
-    for t in spec.types:
+    for t in types:
         name = t.name
-        refs = extract_refs_from_type(t)
-        # Filter to only types that exist in this spec, exclude self-references
-        type_deps[name] = (refs & type_names) - {name}
+        if not (t.methods or t.properties or t.bases or t.related):
+            type_deps[name] = set()
+            continue
+        # Only types that exist in this spec, excluding self-references
+        refs = extract_refs_from_type(t, type_names)
+        refs.discard(name)
+        type_deps[name] = refs
 
     # Build module dependency graph
     module_deps: dict[str, list[str]] = {}
@@ -249,20 +288,15 @@ def deps(
 
     # Handle different output formats
     if output_format == "dot":
-        lines = ["digraph deps {"]
-        for name, deps_set in type_deps.items():
-            for dep in deps_set:
-                lines.append(f'  "{name}" -> "{dep}";')
-        lines.append("}")
-        click.echo("\n".join(lines))
+        edges = (
+            f'  "{name}" -> "{dep}";' for name, deps_set in type_deps.items() for dep in deps_set
+        )
+        click.echo("\n".join(chain(("digraph deps {",), edges, ("}",))))
         return
 
     if output_format == "mermaid":
-        lines = ["graph TD"]
-        for name, deps_set in type_deps.items():
-            for dep in deps_set:
-                lines.append(f"  {name} --> {dep}")
-        click.echo("\n".join(lines))
+        edges = (f"  {name} --> {dep}" for name, deps_set in type_deps.items() for dep in deps_set)
+        click.echo("\n".join(chain(("graph TD",), edges)))
         return
 
     if ctx.text:
@@ -306,38 +340,32 @@ def surface(ctx: Context, public_only: bool, by_module: bool) -> None:
     # Get internal modules
     internal_modules = {m.path for m in spec.modules if m.internal}
 
-    # Count entities
-    types_count = 0
-    functions_count = 0
-    methods_count = 0
-    properties_count = 0
-
-    by_mod: dict[str, dict[str, int]] = defaultdict(lambda: {
-        "types": 0, "functions": 0, "methods": 0, "properties": 0
-    })
+    # Count entities per module
+    type_counts: Counter[str] = Counter()
+    function_counts: Counter[str] = Counter()
+    method_counts: Counter[str] = Counter()
+    property_counts: Counter[str] = Counter()
 
     for t in spec.types:
         mod = t.module
         if public_only and mod in internal_modules:
             continue
 
-        types_count += 1
-        by_mod[mod]["types"] += 1
-
-        methods = len(t.methods)
-        properties = len(t.properties)
-        methods_count += methods
-        properties_count += properties
-        by_mod[mod]["methods"] += methods
-        by_mod[mod]["properties"] += properties
+        type_counts[mod] += 1
+        method_counts[mod] += len(t.methods)
+        property_counts[mod] += len(t.properties)
 
     for func in spec.functions:
         mod = func.module
         if public_only and mod in internal_modules:
             continue
 
-        functions_count += 1
-        by_mod[mod]["functions"] += 1
+        function_counts[mod] += 1
+
+    types_count = sum(type_counts.values())
+    functions_count = sum(function_counts.values())
+    methods_count = sum(method_counts.values())
+    properties_count = sum(property_counts.values())
 
     result: dict[str, Any] = {
         "public_types": types_count,
@@ -347,7 +375,16 @@ def surface(ctx: Context, public_only: bool, by_module: bool) -> None:
     }
 
     if by_module:
-        result["by_module"] = dict(by_mod)
+        # Modules in first-seen order: types first, then function-only modules
+        result["by_module"] = {
+            mod: {
+                "types": type_counts[mod],
+                "functions": function_counts[mod],
+                "methods": method_counts[mod],
+                "properties": property_counts[mod],
+            }
+            for mod in dict.fromkeys([*type_counts, *function_counts])
+        }
 
     if ctx.text:
         click.echo(f"types: {types_count}")
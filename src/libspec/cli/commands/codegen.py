@@ -9,15 +9,24 @@ This module provides the `codegen` CLI command for generating:
 from __future__ import annotations
 
 import ast
+import copy
+import hashlib
+import json
+import os
 import re
 import subprocess
 from collections import defaultdict
-from dataclasses import dataclass, field
+from collections.abc import Iterable
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from keyword import iskeyword
 from pathlib import Path
-from typing import NamedTuple
+from typing import Any, NamedTuple
 
 import click
 
+from libspec import __version__
+
 
 class ImportResult(NamedTuple):
     """Result of collecting imports for a module."""
@@ -45,62 +54,106 @@ PARAM_PATTERN = re.compile(
     r"^(?P<name>\w+)\s*:\s*(?P<type>[^=]+?)(?:\s*=\s*(?P<default>.+))?$"
 )
 
-# Known stdlib type imports (pattern -> import statement)
-# Patterns use word boundaries to avoid false matches
+# Deprecated typing generics and their builtin replacements
+_TYPING_ALIASES: dict[str, str] = {
+    "List": "list[",
+    "Dict": "dict[",
+    "Tuple": "tuple[",
+    "Set": "set[",
+    "FrozenSet": "frozenset[",
+}
+_TYPING_ALIAS_RE = re.compile(r"\b(List|Dict|Tuple|Set|FrozenSet)\[")
+
+# Brackets and commas, the only characters that matter when splitting parameters
+_PARAM_SPLIT_RE = re.compile(r"[,()\[\]{}]")
+
+# Leading 'def name' / 'async def name' in full signatures
+_DEF_PREFIX_RE = re.compile(r"^(async\s+)?def\s+\w+")
+
+# Capitalized identifiers, i.e. candidate type names in annotations and defaults
+_CAP_IDENT_RE = re.compile(r"\b[A-Z][a-zA-Z0-9]*\b")
+# Same, but at least two characters long (skips single-letter TypeVars)
+_CAP_NAME_RE = re.compile(r"\b[A-Z][A-Za-z0-9]+\b")
+
+# Trailing generic parameters on a base class: Handle[T] -> Handle
+_GENERIC_SUFFIX_RE = re.compile(r"\[.*\]$")
+
+_FIELD_WORD_RE = re.compile(r"\bField\b")
+
+# Stub body raise, capturing indentation and function name
+# (ast.unparse may use single or double quotes)
+_NOT_IMPLEMENTED_RAISE_RE = re.compile(
+    r"""^(\s*)raise NotImplementedError\(['"](\w+) not implemented['"]"""
+)
+
+
+@lru_cache(maxsize=1024)
+def _word_re(word: str) -> re.Pattern[str]:
+    """Return a pattern matching word as a whole identifier."""
+    return re.compile(rf"\b{re.escape(word)}\b")
+
+
+# Known stdlib type imports (type name -> import statement)
 STDLIB_TYPE_IMPORTS: dict[str, str] = {
     # datetime module
-    r"\bdatetime\b": "from datetime import datetime",
-    r"\bdate\b": "from datetime import date",
-    r"\btimedelta\b": "from datetime import timedelta",
-    r"\btimezone\b": "from datetime import timezone",
+    "datetime": "from datetime import datetime",
+    "date": "from datetime import date",
+    "timedelta": "from datetime import timedelta",
+    "timezone": "from datetime import timezone",
     # pathlib
-    r"\bPath\b": "from pathlib import Path",
+    "Path": "from pathlib import Path",
     # decimal
-    r"\bDecimal\b": "from decimal import Decimal",
+    "Decimal": "from decimal import Decimal",
     # uuid
-    r"\bUUID\b": "from uuid import UUID",
+    "UUID": "from uuid import UUID",
     # re
-    r"\bPattern\b": "from re import Pattern",
-    r"\bMatch\b": "from re import Match",
+    "Pattern": "from re import Pattern",
+    "Match": "from re import Match",
     # typing - generics and protocols
-    r"\bCallable\b": "from collections.abc import Callable",
-    r"\bAwaitable\b": "from collections.abc import Awaitable",
-    r"\bAsyncIterator\b": "from collections.abc import AsyncIterator",
-    r"\bAsyncGenerator\b": "from collections.abc import AsyncGenerator",
-    r"\bIterator\b": "from collections.abc import Iterator",
-    r"\bGenerator\b": "from collections.abc import Generator",
-    r"\bSequence\b": "from collections.abc import Sequence",
-    r"\bMapping\b": "from collections.abc import Mapping",
-    r"\bMutableMapping\b": "from collections.abc import MutableMapping",
-    r"\bIterable\b": "from collections.abc import Iterable",
-    r"\bCoroutine\b": "from collections.abc import Coroutine",
-    r"\bHashable\b": "from collections.abc import Hashable",
+    "Callable": "from collections.abc import Callable",
+    "Awaitable": "from collections.abc import Awaitable",
+    "AsyncIterator": "from collections.abc import AsyncIterator",
+    "AsyncGenerator": "from collections.abc import AsyncGenerator",
+    "Iterator": "from collections.abc import Iterator",
+    "Generator": "from collections.abc import Generator",
+    "Sequence": "from collections.abc import Sequence",
+    "Mapping": "from collections.abc import Mapping",
+    "MutableMapping": "from collections.abc import MutableMapping",
+    "Iterable": "from collections.abc import Iterable",
+    "Coroutine": "from collections.abc import Coroutine",
+    "Hashable": "from collections.abc import Hashable",
     # typing - special forms
-    r"\bAny\b": "from typing import Any",
-    r"\bLiteral\b": "from typing import Literal",
-    r"\bTypeVar\b": "from typing import TypeVar",
-    r"\bParamSpec\b": "from typing import ParamSpec",
-    r"\bTypeVarTuple\b": "from typing import TypeVarTuple",
-    r"\bGeneric\b": "from typing import Generic",
-    r"\bClassVar\b": "from typing import ClassVar",
-    r"\bFinal\b": "from typing import Final",
-    r"\bTypeAlias\b": "from typing import TypeAlias",
-    r"\bSelf\b": "from typing import Self",
-    r"\bNever\b": "from typing import Never",
-    r"\bNoReturn\b": "from typing import NoReturn",
-    r"\bUnpack\b": "from typing import Unpack",
-    r"\bConcatenate\b": "from typing import Concatenate",
-    r"\bAnnotated\b": "from typing import Annotated",
-    r"\bUnion\b": "from typing import Union",
-    r"\bOptional\b": "from typing import Optional",
-    r"\bType\b": "from typing import Type",
+    "Any": "from typing import Any",
+    "Literal": "from typing import Literal",
+    "TypeVar": "from typing import TypeVar",
+    "ParamSpec": "from typing import ParamSpec",
+    "TypeVarTuple": "from typing import TypeVarTuple",
+    "Generic": "from typing import Generic",
+    "ClassVar": "from typing import ClassVar",
+    "Final": "from typing import Final",
+    "TypeAlias": "from typing import TypeAlias",
+    "Self": "from typing import Self",
+    "Never": "from typing import Never",
+    "NoReturn": "from typing import NoReturn",
+    "Unpack": "from typing import Unpack",
+    "Concatenate": "from typing import Concatenate",
+    "Annotated": "from typing import Annotated",
+    "Union": "from typing import Union",
+    "Optional": "from typing import Optional",
+    "Type": "from typing import Type",
     # types module
-    r"\bTracebackType\b": "from types import TracebackType",
+    "TracebackType": "from types import TracebackType",
     # contextlib
-    r"\bContextManager\b": "from contextlib import AbstractContextManager as ContextManager",
-    r"\bAsyncContextManager\b": "from contextlib import AbstractAsyncContextManager as AsyncContextManager",
+    "ContextManager": "from contextlib import AbstractContextManager as ContextManager",
+    "AsyncContextManager": "from contextlib import AbstractAsyncContextManager as AsyncContextManager",
 }
 
+# All stdlib type names as one alternation, so a single scan finds every hit.
+# Word boundaries avoid false matches (e.g. "date" inside "update").
+_STDLIB_TYPE_RE = re.compile(
+    r"\b(" + "|".join(map(re.escape, STDLIB_TYPE_IMPORTS)) + r")\b"
+)
+
 # Known base class imports for inheritance resolution
 # Maps base class names to their import statements (None = builtin, no import needed)
 KNOWN_BASE_IMPORTS: dict[str, str | None] = {
@@ -163,7 +216,7 @@ STDLIB_DECORATOR_IMPORTS: dict[str, str] = {
 # === Data Models ===
 
 
-@dataclass
+@dataclass(slots=True)
 class ParsedParam:
     """A parsed function parameter."""
 
@@ -173,7 +226,7 @@ class ParsedParam:
     kind: str = "positional_or_keyword"
 
 
-@dataclass
+@dataclass(slots=True)
 class ParsedSignature:
     """A parsed function signature."""
 
@@ -181,7 +234,7 @@ class ParsedSignature:
     returns: str | None
 
 
-@dataclass
+@dataclass(slots=True)
 class ModuleContent:
     """Content to generate for a single module."""
 
@@ -189,13 +242,17 @@ class ModuleContent:
     types: list[dict] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class GenerationResult:
     """Result of code generation."""
 
     module: str
     code: str
     path: Path | None = None
+    line_count: int = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.line_count = self.code.count("\n") + 1
 
 
 # === Type Normalization ===
@@ -214,16 +271,21 @@ def _replace_optional_balanced(type_str: str) -> str:
         if idx == -1:
             break
 
-        # Find the matching closing bracket
+        # Find the matching closing bracket, jumping between brackets
         start = idx + len("Optional[")
         depth = 1
         pos = start
-        while pos < len(result) and depth > 0:
-            if result[pos] == "[":
-                depth += 1
-            elif result[pos] == "]":
+        while depth > 0:
+            close = result.find("]", pos)
+            if close == -1:
+                break
+            open_ = result.find("[", pos, close)
+            if open_ == -1:
                 depth -= 1
-            pos += 1
+                pos = close + 1
+            else:
+                depth += 1
+                pos = open_ + 1
 
         if depth == 0:
             # Extract the inner type and replace
@@ -236,6 +298,12 @@ def _replace_optional_balanced(type_str: str) -> str:
     return result
 
 
+def _lower_typing_alias(match: re.Match[str]) -> str:
+    """Replace a deprecated typing alias with its builtin generic."""
+    return _TYPING_ALIASES[match.group(1)]
+
+
+@lru_cache(maxsize=4096)
 def normalize_type(type_str: str) -> str:
     """Convert type annotations to modern Python 3.10+ syntax.
 
@@ -244,22 +312,18 @@ def normalize_type(type_str: str) -> str:
     - List[X] -> list[X]
     - Dict[K, V] -> dict[K, V]
     """
-    if not type_str:
+    # Both rewrites need a subscript, so plain names are returned as-is
+    if not type_str or "[" not in type_str:
         return type_str
 
     result = type_str
 
     # Convert Optional[X] to X | None (handles nested brackets)
-    result = _replace_optional_balanced(result)
-
-    # Convert List -> list, Dict -> dict, etc.
-    result = re.sub(r"\bList\[", "list[", result)
-    result = re.sub(r"\bDict\[", "dict[", result)
-    result = re.sub(r"\bTuple\[", "tuple[", result)
-    result = re.sub(r"\bSet\[", "set[", result)
-    result = re.sub(r"\bFrozenSet\[", "frozenset[", result)
+    if "Optional[" in result:
+        result = _replace_optional_balanced(result)
 
-    return result
+    # Convert List -> list, Dict -> dict, etc. in one pass
+    return _TYPING_ALIAS_RE.sub(_lower_typing_alias, result)
 
 
 # === Signature Parsing ===
@@ -267,10 +331,19 @@ def normalize_type(type_str: str) -> str:
 
 def parse_signature(sig: str) -> ParsedSignature:
     """Parse a function signature string into components."""
+    parsed = _parse_signature(sig)
+    return ParsedSignature(
+        params=[replace(param) for param in parsed.params], returns=parsed.returns
+    )
+
+
+@lru_cache(maxsize=4096)
+def _parse_signature(sig: str) -> ParsedSignature:
+    """Parse a signature, cached per string. The result is shared; never mutate it."""
     sig = sig.strip()
     # Strip 'async def funcname' or 'def funcname' prefix if present
     # This handles specs that use full signatures like 'async def __aexit__(self, ...) -> bool'
-    sig = re.sub(r"^(async\s+)?def\s+\w+", "", sig).strip()
+    sig = _DEF_PREFIX_RE.sub("", sig).strip()
     match = SIGNATURE_PATTERN.match(sig)
     if not match:
         return ParsedSignature(params=[], returns=None)
@@ -282,31 +355,35 @@ def parse_signature(sig: str) -> ParsedSignature:
 
     params = []
     if params_str:
-        # Split on commas not inside brackets
+        # Split on commas not inside brackets, visiting only bracket/comma tokens
         depth = 0
-        current: list[str] = []
-        for char in params_str + ",":
+        last_cut = 0
+        for tok in _PARAM_SPLIT_RE.finditer(params_str + ","):
+            char = tok.group()
             if char in "([{":
                 depth += 1
-                current.append(char)
             elif char in ")]}":
                 depth -= 1
-                current.append(char)
-            elif char == "," and depth == 0:
-                param_str = "".join(current).strip()
+            elif depth == 0:
+                param_str = params_str[last_cut : tok.start()].strip()
                 if param_str:
-                    param = parse_param(param_str)
+                    param = _parse_param(param_str)
                     if param:
                         params.append(param)
-                current = []
-            else:
-                current.append(char)
+                last_cut = tok.end()
 
     return ParsedSignature(params=params, returns=returns)
 
 
 def parse_param(param_str: str) -> ParsedParam | None:
     """Parse a single parameter string."""
+    param = _parse_param(param_str)
+    return replace(param) if param is not None else None
+
+
+@lru_cache(maxsize=4096)
+def _parse_param(param_str: str) -> ParsedParam | None:
+    """Parse a parameter, cached per string. The result is shared; never mutate it."""
     param_str = param_str.strip()
     match = PARAM_PATTERN.match(param_str)
     if match:
@@ -324,87 +401,79 @@ def parse_param(param_str: str) -> ParsedParam | None:
 # === Docstring Rendering ===
 
 
+def _section(header: str, entries: Iterable[str]) -> str:
+    """Render a docstring section: a header line followed by indented entries."""
+    return "\n    ".join((header, *entries))
+
+
+def _param_doc_line(p: dict[str, Any]) -> str:
+    """Render one Args entry for a function parameter."""
+    kind_str = ""
+    p_kind = p.get("kind", "positional_or_keyword")
+    if p_kind == "keyword_only":
+        kind_str = " (keyword-only)"
+    elif p_kind == "positional_only":
+        kind_str = " (positional-only)"
+
+    default_str = ""
+    if p.get("default") and p["default"] != "REQUIRED":
+        default_str = f" (default: {p['default']})"
+    return f"{p['name']}{kind_str}: {p.get('description', '')}{default_str}"
+
+
 def render_function_docstring(func: dict, spec: dict | None = None) -> str:
     """Render docstring for a function from libspec data."""
-    lines = [func.get("description", "")]
+    sections = [func.get("description", "")]
 
     # Add maturity status
     maturity = func.get("maturity")
     if maturity:
-        lines.append("")
-        lines.append(f"Status: {maturity}")
+        sections.append(f"Status: {maturity}")
 
     # Add function kind for special function types
     func_kind = func.get("kind")
     if func_kind in ("decorator", "context_manager", "async_context_manager"):
-        lines.append("")
-        lines.append(f"Kind: {func_kind.replace('_', ' ')}")
+        sections.append(f"Kind: {func_kind.replace('_', ' ')}")
 
     params = func.get("parameters", [])
     if params:
-        lines.append("")
-        lines.append("Args:")
-        for p in params:
-            kind_str = ""
-            p_kind = p.get("kind", "positional_or_keyword")
-            if p_kind == "keyword_only":
-                kind_str = " (keyword-only)"
-            elif p_kind == "positional_only":
-                kind_str = " (positional-only)"
-
-            default_str = ""
-            if p.get("default") and p["default"] != "REQUIRED":
-                default_str = f" (default: {p['default']})"
-            lines.append(
-                f"    {p['name']}{kind_str}: {p.get('description', '')}{default_str}"
-            )
+        sections.append(_section("Args:", map(_param_doc_line, params)))
 
     returns = func.get("returns")
     if returns:
-        lines.append("")
-        lines.append("Returns:")
-        lines.append(f"    {returns.get('description', returns.get('type', ''))}")
+        sections.append(
+            _section("Returns:", (str(returns.get("description", returns.get("type", ""))),))
+        )
 
     yields = func.get("yields")
     if yields:
-        lines.append("")
-        lines.append("Yields:")
         yield_type = yields.get("type", "")
         yield_desc = yields.get("description", "")
         if yield_type and yield_desc:
-            lines.append(f"    {yield_type}: {yield_desc}")
-        elif yield_desc:
-            lines.append(f"    {yield_desc}")
-        elif yield_type:
-            lines.append(f"    {yield_type}")
+            yield_lines: tuple[str, ...] = (f"{yield_type}: {yield_desc}",)
+        elif yield_desc or yield_type:
+            yield_lines = (yield_desc or yield_type,)
+        else:
+            yield_lines = ()
+        sections.append(_section("Yields:", yield_lines))
 
     raises = func.get("raises", [])
     if raises:
-        lines.append("")
-        lines.append("Raises:")
-        for r in raises:
-            lines.append(f"    {r['type']}: {r.get('when', '')}")
+        sections.append(
+            _section("Raises:", (f"{r['type']}: {r.get('when', '')}" for r in raises))
+        )
 
     preconditions = func.get("preconditions", [])
     if preconditions:
-        lines.append("")
-        lines.append("Preconditions:")
-        for p in preconditions:
-            lines.append(f"    - {p}")
+        sections.append(_section("Preconditions:", (f"- {p}" for p in preconditions)))
 
     postconditions = func.get("postconditions", [])
     if postconditions:
-        lines.append("")
-        lines.append("Postconditions:")
-        for p in postconditions:
-            lines.append(f"    - {p}")
+        sections.append(_section("Postconditions:", (f"- {p}" for p in postconditions)))
 
     invariants = func.get("invariants", [])
     if invariants:
-        lines.append("")
-        lines.append("Invariants:")
-        for i in invariants:
-            lines.append(f"    - {i}")
+        sections.append(_section("Invariants:", (f"- {i}" for i in invariants)))
 
     # Properties
     props = []
@@ -415,97 +484,173 @@ def render_function_docstring(func: dict, spec: dict | None = None) -> str:
     if func.get("idempotent"):
         props.append("This function is idempotent.")
     if props:
-        lines.append("")
-        lines.append("Note:")
-        for p in props:
-            lines.append(f"    {p}")
+        sections.append(_section("Note:", props))
 
     example = func.get("example")
     if example:
-        lines.append("")
-        lines.append("Example:")
-        lines.append(f"    >>> {example}")
+        sections.append(f"Example:\n    >>> {example}")
 
     related = func.get("related", [])
     if related:
-        lines.append("")
-        lines.append("See Also:")
-        for r in related:
-            lines.append(f"    - {r}")
+        sections.append(_section("See Also:", (f"- {r}" for r in related)))
+
+    return "\n\n".join(sections)
 
-    return "\n".join(lines)
+
+def _property_doc_line(p: dict[str, Any]) -> str:
+    """Render one Attributes entry for a type property."""
+    constraints_str = ""
+    if p.get("constraints"):
+        const_parts = [f"{k}={v}" for k, v in p["constraints"].items()]
+        constraints_str = f" (range: {', '.join(const_parts)})"
+
+    default_str = ""
+    if p.get("default"):
+        default_str = f" (default: {p['default']})"
+    return (
+        f"{p['name']} ({p.get('type', 'Any')}): {p.get('description', '')}"
+        f"{constraints_str}{default_str}"
+    )
 
 
 def render_type_docstring(typ: dict) -> str:
     """Render docstring for a type from libspec data."""
-    lines = [typ.get("docstring", "")]
+    sections = [typ.get("docstring", "")]
 
     maturity = typ.get("maturity")
     if maturity:
-        lines.append("")
-        lines.append(f"Status: {maturity}")
+        sections.append(f"Status: {maturity}")
 
     kind = typ.get("kind", "")
     values = typ.get("values", [])
     if kind == "enum" and values:
-        lines.append("")
-        lines.append("Values:")
+        value_lines = []
         for v in values:
-            desc = v.get("description", "")
             val = v.get("value", "")
             suffix = f" ({val})" if val else ""
-            lines.append(f"    {v['name']}: {desc}{suffix}")
+            value_lines.append(f"{v['name']}: {v.get('description', '')}{suffix}")
+        sections.append(_section("Values:", value_lines))
 
     properties = typ.get("properties", [])
     if properties:
-        lines.append("")
-        lines.append("Attributes:")
-        for p in properties:
-            constraints_str = ""
-            if p.get("constraints"):
-                const_parts = [f"{k}={v}" for k, v in p["constraints"].items()]
-                constraints_str = f" (range: {', '.join(const_parts)})"
-
-            default_str = ""
-            if p.get("default"):
-                default_str = f" (default: {p['default']})"
-            lines.append(
-                f"    {p['name']} ({p.get('type', 'Any')}): {p.get('description', '')}{constraints_str}{default_str}"
-            )
+        sections.append(_section("Attributes:", map(_property_doc_line, properties)))
 
     invariants = typ.get("invariants", [])
     if invariants:
-        lines.append("")
-        lines.append("Invariants:")
-        for i in invariants:
-            lines.append(f"    - {i}")
+        sections.append(_section("Invariants:", (f"- {i}" for i in invariants)))
 
     related = typ.get("related", [])
     if related:
-        lines.append("")
-        lines.append("See Also:")
-        for r in related:
-            lines.append(f"    - {r}")
+        sections.append(_section("See Also:", (f"- {r}" for r in related)))
 
     example = typ.get("example")
     if example:
-        lines.append("")
-        lines.append("Example:")
-        lines.append(f"    >>> {example}")
+        sections.append(f"Example:\n    >>> {example}")
 
-    return "\n".join(lines)
+    return "\n\n".join(sections)
 
 
 # === AST Code Generation ===
 
+# Expression contexts carry no state, so one instance of each serves every node
+_LOAD = ast.Load()
+_STORE = ast.Store()
 
-def make_type_annotation(type_str: str) -> ast.expr:
-    """Create an AST node for a type annotation string."""
+_NOT_IMPLEMENTED_ERROR = ast.Name(id="NotImplementedError", ctx=_LOAD)
+
+
+def _name(id: str) -> ast.Name:
+    """Create a Name node in load context."""
+    return ast.Name(id=id, ctx=_LOAD)
+
+
+# Template nodes reused by every generated class; generation never mutates them
+_ENUM_BASE = ast.Attribute(value=_name("enum"), attr="Enum", ctx=_LOAD)
+_DATACLASS_DECORATOR = _name("dataclass")
+_FIELD = _name("field")
+_PYDANTIC_FIELD = _name("Field")
+_NO_ARGUMENTS = ast.arguments(
+    posonlyargs=[],
+    args=[],
+    vararg=None,
+    kwonlyargs=[],
+    kw_defaults=[],
+    kwarg=None,
+    defaults=[],
+)
+# Builtin default factories, by name
+_FACTORY_NAMES: dict[str, ast.expr] = {
+    name: _name(name) for name in ("list", "dict", "set", "frozenset")
+}
+# Empty literals returned by dataclass default_factory lambdas
+_EMPTY_LITERALS: dict[str, ast.expr] = {
+    "list": ast.List(elts=[], ctx=_LOAD),
+    "dict": ast.Dict(keys=[], values=[]),
+    "set": ast.Call(func=_FACTORY_NAMES["set"], args=[], keywords=[]),
+}
+
+
+def _bases_list(
+    typ: dict[str, Any], typevar_renames: dict[str, str] | None = None
+) -> list[ast.expr]:
+    """Build Name nodes for a type's declared bases, applying any TypeVar renames."""
+    bases = typ.get("bases", ())
+    if not typevar_renames:
+        return [_name(base) for base in bases]
+    patterns = [(_word_re(original), renamed) for original, renamed in typevar_renames.items()]
+    result: list[ast.expr] = []
+    for base in bases:
+        # Replace TypeVar references in base class, e.g., Handle[T] -> Handle[T_co]
+        for pattern, renamed in patterns:
+            base = pattern.sub(renamed, base)
+        result.append(_name(base))
+    return result
+
+
+def _not_implemented_body(name: str, docstring: str) -> list[ast.stmt]:
+    """Build a stub body: the docstring, then raise NotImplementedError."""
+    return [
+        ast.Expr(value=ast.Constant(value=docstring)),
+        ast.Raise(
+            exc=ast.Call(
+                func=_NOT_IMPLEMENTED_ERROR,
+                args=[ast.Constant(value=f"{name} not implemented")],
+                keywords=[],
+            ),
+            cause=None,
+        ),
+    ]
+
+
+@lru_cache(maxsize=8192)
+def _parse_expr(source: str) -> ast.expr:
+    """Parse a Python expression, falling back to a string constant.
+
+    Nodes are cached per string and shared between the modules that use
+    them, which is safe because nothing mutates the tree before unparsing.
+    """
     try:
-        node = ast.parse(type_str, mode="eval").body
-        return node
+        return ast.parse(source, mode="eval").body
     except SyntaxError:
-        return ast.Constant(value=type_str)
+        return ast.Constant(value=source)
+
+
+def _is_plain_name(name: str) -> bool:
+    """Check whether a string is a bare identifier that parses to ast.Name."""
+    return name.isidentifier() and name.isascii() and not iskeyword(name)
+
+
+def make_type_annotation(type_str: str) -> ast.expr:
+    """Create an AST node for a type annotation string.
+
+    Bare and dotted names (the bulk of annotations) are built directly;
+    anything else goes through the parser.
+    """
+    if _is_plain_name(type_str):
+        return _name(type_str)
+    if "." in type_str and all(map(_is_plain_name, type_str.split("."))):
+        return _make_name_or_attribute(type_str)
+    return _parse_expr(type_str)
 
 
 def generate_decorator_ast(decorator: str | dict) -> ast.expr:
@@ -524,53 +669,47 @@ def generate_decorator_ast(decorator: str | dict) -> ast.expr:
     if isinstance(decorator, str):
         # Simple decorator name
         return _make_name_or_attribute(decorator)
+    return _decorator_from_spec(decorator)
 
-    # DecoratorSpec dict
-    name = decorator.get("name", "")
-    args = decorator.get("args", [])
-    kwargs = decorator.get("kwargs", {})
-    call = decorator.get("call", True)
 
+def _decorator_from_spec(decorator: dict[str, Any]) -> ast.expr:
+    """Generate AST for a DecoratorSpec dict (see generate_decorator_ast)."""
     # Build the decorator name (may be dotted)
-    name_node = _make_name_or_attribute(name)
-
-    # If no args/kwargs and call is False, just return the name
-    if not args and not kwargs and not call:
-        return name_node
+    name_node = _make_name_or_attribute(decorator.get("name", ""))
+    args = decorator.get("args")
+    kwargs = decorator.get("kwargs")
 
-    # If no args/kwargs but call is True (default), return name()
     if not args and not kwargs:
+        # Bare name when call is False, otherwise name()
+        if not decorator.get("call", True):
+            return name_node
         return ast.Call(func=name_node, args=[], keywords=[])
 
     # Build call with args and kwargs
-    arg_nodes = []
-    for arg in args:
-        try:
-            arg_nodes.append(ast.parse(arg, mode="eval").body)
-        except SyntaxError:
-            arg_nodes.append(ast.Constant(value=arg))
-
-    kwarg_nodes = []
-    for key, value in kwargs.items():
-        try:
-            value_node = ast.parse(value, mode="eval").body
-        except SyntaxError:
-            value_node = ast.Constant(value=value)
-        kwarg_nodes.append(ast.keyword(arg=key, value=value_node))
-
+    arg_nodes = [_parse_expr(arg) for arg in args or ()]
+    kwarg_nodes = (
+        [ast.keyword(arg=key, value=_parse_expr(value)) for key, value in kwargs.items()]
+        if kwargs
+        else []
+    )
     return ast.Call(func=name_node, args=arg_nodes, keywords=kwarg_nodes)
 
 
 def _make_name_or_attribute(dotted_name: str) -> ast.expr:
     """Create Name or Attribute node for a potentially dotted name."""
-    parts = dotted_name.split(".")
-    if len(parts) == 1:
-        return ast.Name(id=parts[0], ctx=ast.Load())
+    # Most names (property, classmethod, contextmanager) have no dots
+    if "." not in dotted_name:
+        return _name(dotted_name)
+    return _make_attribute(dotted_name)
+
 
-    # Build nested Attribute nodes
-    result: ast.expr = ast.Name(id=parts[0], ctx=ast.Load())
+@lru_cache(maxsize=1024)
+def _make_attribute(dotted_name: str) -> ast.expr:
+    """Create nested Attribute nodes for a dotted name like "mcp.tool"."""
+    parts = dotted_name.split(".")
+    result: ast.expr = _name(parts[0])
     for part in parts[1:]:
-        result = ast.Attribute(value=result, attr=part, ctx=ast.Load())
+        result = ast.Attribute(value=result, attr=part, ctx=_LOAD)
     return result
 
 
@@ -583,7 +722,7 @@ def generate_function_ast(
     """Build AST for a function stub."""
     name = func["name"]
     sig_str = func.get("signature", "()")
-    sig = parse_signature(sig_str)
+    sig = _parse_signature(sig_str)
 
     func_kind = func.get("kind", "function")
 
@@ -622,10 +761,7 @@ def generate_function_ast(
 
         default_node = None
         if p.default is not None:
-            try:
-                default_node = ast.parse(p.default, mode="eval").body
-            except SyntaxError:
-                default_node = ast.Constant(value=p.default)
+            default_node = _parse_expr(p.default)
 
         if kind == "positional_only":
             posonlyargs.append(arg)
@@ -663,17 +799,7 @@ def generate_function_ast(
 
     docstring = render_function_docstring(func, spec)
 
-    body: list[ast.stmt] = [
-        ast.Expr(value=ast.Constant(value=docstring)),
-        ast.Raise(
-            exc=ast.Call(
-                func=ast.Name(id="NotImplementedError", ctx=ast.Load()),
-                args=[ast.Constant(value=f"{name} not implemented")],
-                keywords=[],
-            ),
-            cause=None,
-        ),
-    ]
+    body = _not_implemented_body(name, docstring)
 
     # Build decorator list
     decorators: list[ast.expr] = []
@@ -681,19 +807,22 @@ def generate_function_ast(
     # Add method type decorators first
     if is_method:
         if method_type == "classmethod":
-            decorators.append(ast.Name(id="classmethod", ctx=ast.Load()))
+            decorators.append(_name("classmethod"))
         elif method_type == "staticmethod":
-            decorators.append(ast.Name(id="staticmethod", ctx=ast.Load()))
+            decorators.append(_name("staticmethod"))
 
     # Add function kind decorators
     if func_kind == "context_manager":
-        decorators.append(ast.Name(id="contextmanager", ctx=ast.Load()))
+        decorators.append(_name("contextmanager"))
     elif func_kind == "async_context_manager":
-        decorators.append(ast.Name(id="asynccontextmanager", ctx=ast.Load()))
+        decorators.append(_name("asynccontextmanager"))
 
-    # Add decorators from libspec
-    for dec in func.get("decorators", []):
-        decorators.append(generate_decorator_ast(dec))
+    # Add decorators from libspec; plain names (the usual case) need no spec handling
+    for dec in func.get("decorators", ()):
+        if isinstance(dec, str):
+            decorators.append(_make_name_or_attribute(dec))
+        else:
+            decorators.append(_decorator_from_spec(dec))
 
     # Use AsyncFunctionDef for async functions
     if func_kind == "async_context_manager":
@@ -716,6 +845,27 @@ def generate_function_ast(
     )
 
 
+def _append_methods(body: list[ast.stmt], typ: dict[str, Any]) -> None:
+    """Append method stubs for a type to a class body.
+
+    Only the keys that shape a method stub are forwarded; other method
+    fields (decorators, raises, ...) are not rendered on class methods.
+    """
+    body.extend(
+        generate_function_ast(
+            {
+                "name": method["name"],
+                "signature": method.get("signature", "()"),
+                "description": method.get("description", ""),
+                "returns": method.get("returns"),  # Pass through for return type fallback
+                "parameters": method.get("parameters", []),  # Pass through for defaults
+            },
+            is_method=True,
+        )
+        for method in typ.get("methods", ())
+    )
+
+
 def generate_enum_ast(typ: dict, use_pydantic: bool = False) -> ast.ClassDef:
     """Build AST for an enum type."""
     name = typ["name"]
@@ -730,31 +880,15 @@ def generate_enum_ast(typ: dict, use_pydantic: bool = False) -> ast.ClassDef:
         val_value = val.get("value", val_name.lower())
         body.append(
             ast.Assign(
-                targets=[ast.Name(id=val_name, ctx=ast.Store())],
+                targets=[ast.Name(id=val_name, ctx=_STORE)],
                 value=ast.Constant(value=val_value),
             )
         )
 
-    if len(body) == 1:
-        body.append(ast.Pass())
-
     if use_pydantic:
-        bases: list[ast.expr] = [
-            ast.Name(id="str", ctx=ast.Load()),
-            ast.Attribute(
-                value=ast.Name(id="enum", ctx=ast.Load()),
-                attr="Enum",
-                ctx=ast.Load(),
-            ),
-        ]
+        bases: list[ast.expr] = [_name("str"), _ENUM_BASE]
     else:
-        bases = [
-            ast.Attribute(
-                value=ast.Name(id="enum", ctx=ast.Load()),
-                attr="Enum",
-                ctx=ast.Load(),
-            )
-        ]
+        bases = [_ENUM_BASE]
 
     return ast.ClassDef(
         name=name,
@@ -766,26 +900,40 @@ def generate_enum_ast(typ: dict, use_pydantic: bool = False) -> ast.ClassDef:
     )
 
 
-def _get_factory_for_mutable_default(default: str, type_hint: str) -> str:
-    """Determine the correct factory function for a mutable default.
+def _is_ctor_call(default: str) -> bool:
+    """Check whether a default calls a class with no arguments, e.g. "Settings()"."""
+    name = default[:-2]
+    return (
+        default.endswith("()")
+        and name.isascii()
+        and name.isalnum()
+        and name[0].isupper()
+    )
+
+
+def _mutable_default_factory(default: str, type_hint: str) -> str | None:
+    """Classify a default value and pick its factory if it is mutable.
 
     Args:
-        default: The default value string (e.g., "{}", "[]", "set()")
+        default: The default value string (e.g., "{}", "[]", "set()", "0")
         type_hint: The type annotation string (e.g., "set[str]", "dict[str, Any]")
 
     Returns:
-        The factory function name ("list", "dict", "set", or a class name)
+        The factory function name ("list", "dict", "set", "frozenset", or a
+        class name), or None if the default is an ordinary immutable value.
     """
     # Explicit set() default
     if default == "set()":
         return "set"
 
+    first = default[:1]
+
     # List defaults
-    if default == "[]" or default.startswith("["):
+    if first == "[":
         return "list"
 
     # Braces - could be dict or set depending on type annotation
-    if default.startswith("{"):
+    if first == "{":
         type_lower = type_hint.lower()
         if type_lower.startswith("set[") or type_lower == "set":
             return "set"
@@ -794,11 +942,10 @@ def _get_factory_for_mutable_default(default: str, type_hint: str) -> str:
         return "dict"
 
     # Constructor call (e.g., "MyClass()")
-    if re.match(r"^[A-Z][a-zA-Z0-9]*\(\)$", default):
+    if _is_ctor_call(default):
         return default[:-2]  # Remove "()"
 
-    # Fallback
-    return "list"
+    return None
 
 
 def generate_dataclass_ast(typ: dict) -> ast.ClassDef:
@@ -818,60 +965,31 @@ def generate_dataclass_ast(typ: dict) -> ast.ClassDef:
         annotation = make_type_annotation(prop_type)
 
         if default is not None:
-            is_mutable_default = (
-                default in ("[]", "{}", "set()")
-                or default.startswith("[")
-                or default.startswith("{")
-                or re.match(r"^[A-Z][a-zA-Z0-9]*\(\)$", default) is not None
-            )
+            factory_name = _mutable_default_factory(default, prop_type)
 
-            if is_mutable_default:
+            if factory_name is not None:
                 # Use lambda returning empty literal for proper type inference
                 # e.g., default_factory=lambda: {} instead of default_factory=dict
-                factory_name = _get_factory_for_mutable_default(default, prop_type)
-                if factory_name == "list":
-                    empty_literal: ast.expr = ast.List(elts=[], ctx=ast.Load())
-                elif factory_name == "dict":
-                    empty_literal = ast.Dict(keys=[], values=[])
-                elif factory_name == "set":
-                    empty_literal = ast.Call(
-                        func=ast.Name(id="set", ctx=ast.Load()),
-                        args=[],
-                        keywords=[],
-                    )
-                else:
+                empty_literal = _EMPTY_LITERALS.get(factory_name)
+                if empty_literal is None:
                     # For custom class factories, use the constructor
                     empty_literal = ast.Call(
-                        func=ast.Name(id=factory_name, ctx=ast.Load()),
+                        func=_name(factory_name),
                         args=[],
                         keywords=[],
                     )
-                factory = ast.Lambda(
-                    args=ast.arguments(
-                        posonlyargs=[],
-                        args=[],
-                        vararg=None,
-                        kwonlyargs=[],
-                        kw_defaults=[],
-                        kwarg=None,
-                        defaults=[],
-                    ),
-                    body=empty_literal,
-                )
+                factory = ast.Lambda(args=_NO_ARGUMENTS, body=empty_literal)
                 default_node = ast.Call(
-                    func=ast.Name(id="field", ctx=ast.Load()),
+                    func=_FIELD,
                     args=[],
                     keywords=[ast.keyword(arg="default_factory", value=factory)],
                 )
             else:
-                try:
-                    default_node = ast.parse(default, mode="eval").body
-                except SyntaxError:
-                    default_node = ast.Constant(value=default)
+                default_node = _parse_expr(default)
 
             body.append(
                 ast.AnnAssign(
-                    target=ast.Name(id=prop_name, ctx=ast.Store()),
+                    target=ast.Name(id=prop_name, ctx=_STORE),
                     annotation=annotation,
                     value=default_node,
                     simple=1,
@@ -880,31 +998,18 @@ def generate_dataclass_ast(typ: dict) -> ast.ClassDef:
         else:
             body.append(
                 ast.AnnAssign(
-                    target=ast.Name(id=prop_name, ctx=ast.Store()),
+                    target=ast.Name(id=prop_name, ctx=_STORE),
                     annotation=annotation,
                     value=None,
                     simple=1,
                 )
             )
 
-    for method in typ.get("methods", []):
-        method_dict = {
-            "name": method["name"],
-            "signature": method.get("signature", "()"),
-            "description": method.get("description", ""),
-            "returns": method.get("returns"),  # Pass through for return type fallback
-            "parameters": method.get("parameters", []),  # Pass through for defaults
-        }
-        body.append(generate_function_ast(method_dict, is_method=True))
+    _append_methods(body, typ)
 
-    if len(body) == 1:
-        body.append(ast.Pass())
+    decorator = _DATACLASS_DECORATOR
 
-    decorator = ast.Name(id="dataclass", ctx=ast.Load())
-
-    bases: list[ast.expr] = [
-        ast.Name(id=base, ctx=ast.Load()) for base in typ.get("bases", [])
-    ]
+    bases = _bases_list(typ)
 
     # Add Generic[T, ...] if type has generic_params
     generic_params = typ.get("generic_params", [])
@@ -921,6 +1026,23 @@ def generate_dataclass_ast(typ: dict) -> ast.ClassDef:
     )
 
 
+# libspec property constraints and the pydantic Field() keywords they map to
+_CONSTRAINT_MAPPING: tuple[tuple[str, str], ...] = (
+    ("ge", "ge"),
+    ("le", "le"),
+    ("gt", "gt"),
+    ("lt", "lt"),
+    ("min", "ge"),
+    ("max", "le"),
+    ("minLength", "min_length"),
+    ("maxLength", "max_length"),
+    ("pattern", "pattern"),
+)
+
+# Marks a constraint key that is absent (a present key may hold None)
+_MISSING = object()
+
+
 def generate_pydantic_model_ast(typ: dict) -> ast.ClassDef:
     """Build AST for a Pydantic BaseModel type."""
     name = typ["name"]
@@ -942,24 +1064,15 @@ def generate_pydantic_model_ast(typ: dict) -> ast.ClassDef:
         field_keywords: list[ast.keyword] = []
 
         if default is not None:
-            is_mutable = (
-                default in ("[]", "{}", "set()")
-                or default.startswith("[")
-                or default.startswith("{")
-                or re.match(r"^[A-Z][a-zA-Z0-9]*\(\)$", default) is not None
-            )
+            factory_name = _mutable_default_factory(default, prop_type)
 
-            if is_mutable:
-                factory_name = _get_factory_for_mutable_default(default, prop_type)
-                factory = ast.Name(id=factory_name, ctx=ast.Load())
+            if factory_name is not None:
+                factory = _FACTORY_NAMES.get(factory_name) or _name(factory_name)
                 field_keywords.append(
                     ast.keyword(arg="default_factory", value=factory)
                 )
             else:
-                try:
-                    default_node = ast.parse(default, mode="eval").body
-                except SyntaxError:
-                    default_node = ast.Constant(value=default)
+                default_node = _parse_expr(default)
                 field_keywords.append(ast.keyword(arg="default", value=default_node))
 
         if description:
@@ -967,27 +1080,17 @@ def generate_pydantic_model_ast(typ: dict) -> ast.ClassDef:
                 ast.keyword(arg="description", value=ast.Constant(value=description))
             )
 
-        constraint_mapping = {
-            "ge": "ge",
-            "le": "le",
-            "gt": "gt",
-            "lt": "lt",
-            "min": "ge",
-            "max": "le",
-            "minLength": "min_length",
-            "maxLength": "max_length",
-            "pattern": "pattern",
-        }
-        for libspec_key, pydantic_key in constraint_mapping.items():
-            if libspec_key in constraints:
-                val = constraints[libspec_key]
-                field_keywords.append(
-                    ast.keyword(arg=pydantic_key, value=ast.Constant(value=val))
-                )
+        if constraints:
+            for libspec_key, pydantic_key in _CONSTRAINT_MAPPING:
+                val = constraints.get(libspec_key, _MISSING)
+                if val is not _MISSING:
+                    field_keywords.append(
+                        ast.keyword(arg=pydantic_key, value=ast.Constant(value=val))
+                    )
 
         if field_keywords:
             value_node: ast.expr | None = ast.Call(
-                func=ast.Name(id="Field", ctx=ast.Load()),
+                func=_PYDANTIC_FIELD,
                 args=[],
                 keywords=field_keywords,
             )
@@ -998,34 +1101,19 @@ def generate_pydantic_model_ast(typ: dict) -> ast.ClassDef:
 
         body.append(
             ast.AnnAssign(
-                target=ast.Name(id=prop_name, ctx=ast.Store()),
+                target=ast.Name(id=prop_name, ctx=_STORE),
                 annotation=annotation,
                 value=value_node,
                 simple=1,
             )
         )
 
-    for method in typ.get("methods", []):
-        method_dict = {
-            "name": method["name"],
-            "signature": method.get("signature", "()"),
-            "description": method.get("description", ""),
-            "returns": method.get("returns"),  # Pass through for return type fallback
-            "parameters": method.get("parameters", []),  # Pass through for defaults
-        }
-        body.append(generate_function_ast(method_dict, is_method=True))
-
-    if len(body) == 1:
-        body.append(ast.Pass())
+    _append_methods(body, typ)
 
     # Use bases from spec, defaulting to BaseModel if none specified
-    spec_bases = typ.get("bases", [])
-    if spec_bases:
-        bases: list[ast.expr] = [
-            ast.Name(id=base, ctx=ast.Load()) for base in spec_bases
-        ]
-    else:
-        bases = [ast.Name(id="BaseModel", ctx=ast.Load())]
+    bases = _bases_list(typ)
+    if not bases:
+        bases = [_name("BaseModel")]
 
     # Add Generic[T, ...] if type has generic_params
     generic_params = typ.get("generic_params", [])
@@ -1063,24 +1151,22 @@ def build_generic_base(generic_params: list[dict], base_name: str = "Generic") -
     param_names = [get_generic_param_name(p) for p in generic_params]
 
     if len(param_names) == 1:
-        slice_node: ast.expr = ast.Name(id=param_names[0], ctx=ast.Load())
+        slice_node: ast.expr = _name(param_names[0])
     else:
         slice_node = ast.Tuple(
-            elts=[ast.Name(id=n, ctx=ast.Load()) for n in param_names],
-            ctx=ast.Load(),
+            elts=[_name(n) for n in param_names],
+            ctx=_LOAD,
         )
 
     return ast.Subscript(
-        value=ast.Name(id=base_name, ctx=ast.Load()),
+        value=_name(base_name),
         slice=slice_node,
-        ctx=ast.Load(),
+        ctx=_LOAD,
     )
 
 
 def generate_class_ast(typ: dict) -> ast.ClassDef:
     """Build AST for a regular class type."""
-    import re
-
     name = typ["name"]
     docstring = render_type_docstring(typ)
 
@@ -1088,18 +1174,7 @@ def generate_class_ast(typ: dict) -> ast.ClassDef:
         ast.Expr(value=ast.Constant(value=docstring)),
     ]
 
-    for method in typ.get("methods", []):
-        method_dict = {
-            "name": method["name"],
-            "signature": method.get("signature", "()"),
-            "description": method.get("description", ""),
-            "returns": method.get("returns"),  # Pass through for return type fallback
-            "parameters": method.get("parameters", []),  # Pass through for defaults
-        }
-        body.append(generate_function_ast(method_dict, is_method=True))
-
-    if len(body) == 1:
-        body.append(ast.Pass())
+    _append_methods(body, typ)
 
     # Build local TypeVar renames for this class's generic_params
     # e.g., if this class has covariant T, we rename T -> T_co in base class refs
@@ -1112,18 +1187,7 @@ def generate_class_ast(typ: dict) -> ast.ClassDef:
             local_typevar_renames[original_name] = renamed
 
     # Apply local TypeVar renames to base class references
-    raw_bases = typ.get("bases", [])
-    processed_bases: list[str] = []
-    for base in raw_bases:
-        for original, renamed in local_typevar_renames.items():
-            # Replace TypeVar references in base class, e.g., Handle[T] -> Handle[T_co]
-            pattern = rf"\b{re.escape(original)}\b"
-            base = re.sub(pattern, renamed, base)
-        processed_bases.append(base)
-
-    bases: list[ast.expr] = [
-        ast.Name(id=base, ctx=ast.Load()) for base in processed_bases
-    ]
+    bases = _bases_list(typ, local_typevar_renames)
 
     # Add Generic[T, ...] if type has generic_params
     if generic_params:
@@ -1141,8 +1205,6 @@ def generate_class_ast(typ: dict) -> ast.ClassDef:
 
 def generate_protocol_ast(typ: dict) -> ast.ClassDef:
     """Build AST for a Protocol type."""
-    import re
-
     name = typ["name"]
     docstring = render_type_docstring(typ)
 
@@ -1150,18 +1212,7 @@ def generate_protocol_ast(typ: dict) -> ast.ClassDef:
         ast.Expr(value=ast.Constant(value=docstring)),
     ]
 
-    for method in typ.get("methods", []):
-        method_dict = {
-            "name": method["name"],
-            "signature": method.get("signature", "()"),
-            "description": method.get("description", ""),
-            "returns": method.get("returns"),  # Pass through for return type fallback
-            "parameters": method.get("parameters", []),  # Pass through for defaults
-        }
-        body.append(generate_function_ast(method_dict, is_method=True))
-
-    if len(body) == 1:
-        body.append(ast.Pass())
+    _append_methods(body, typ)
 
     # Build local TypeVar renames for this protocol's generic_params
     generic_params = typ.get("generic_params", [])
@@ -1176,14 +1227,10 @@ def generate_protocol_ast(typ: dict) -> ast.ClassDef:
     if generic_params:
         bases: list[ast.expr] = [build_generic_base(generic_params, base_name="Protocol")]
     else:
-        bases = [ast.Name(id="Protocol", ctx=ast.Load())]
+        bases = [_name("Protocol")]
 
     # Apply local TypeVar renames to base class references
-    for base in typ.get("bases", []):
-        for original, renamed in local_typevar_renames.items():
-            pattern = rf"\b{re.escape(original)}\b"
-            base = re.sub(pattern, renamed, base)
-        bases.append(ast.Name(id=base, ctx=ast.Load()))
+    bases.extend(_bases_list(typ, local_typevar_renames))
 
     return ast.ClassDef(
         name=name,
@@ -1202,8 +1249,8 @@ def generate_type_alias_ast(typ: dict) -> ast.AnnAssign:
     target_type = typ.get("type_target") or typ.get("target", "Any")
 
     return ast.AnnAssign(
-        target=ast.Name(id=name, ctx=ast.Store()),
-        annotation=ast.Name(id="TypeAlias", ctx=ast.Load()),
+        target=ast.Name(id=name, ctx=_STORE),
+        annotation=_name("TypeAlias"),
         value=make_type_annotation(target_type),
         simple=1,
     )
@@ -1291,6 +1338,106 @@ def build_type_module_map(spec: dict) -> dict[str, str]:
     return type_map
 
 
+def _stdlib_imports_for(text: str) -> set[str]:
+    """Return import statements for every known stdlib type named in text."""
+    return {STDLIB_TYPE_IMPORTS[m.group(1)] for m in _STDLIB_TYPE_RE.finditer(text)}
+
+
+def _generic_param_kind(param: dict[str, Any]) -> str:
+    """Return a generic param's kind, mapping the deprecated bound="ParamSpec" form."""
+    kind: str = param.get("kind", "type_var")
+    # Handle deprecated bound="ParamSpec" pattern (Issue 1 fix)
+    if kind == "type_var" and param.get("bound") == "ParamSpec":
+        return "param_spec"
+    return kind
+
+
+# Opening characters of list, dict and set literal defaults
+_LITERAL_DEFAULT_PREFIXES = ("[", "{")
+
+
+def _has_literal_default(prop: dict[str, Any]) -> bool:
+    """Check whether a property default is a list, dict or set literal."""
+    default = prop.get("default") or ""
+    # "[]" and "{}" are covered by the prefix check
+    return default.startswith(_LITERAL_DEFAULT_PREFIXES) or default == "set()"
+
+
+def _base_class_import(
+    base: str, type_module_map: dict[str, str] | None, current_module: str
+) -> str | None:
+    """Resolve the import statement a base class needs, if any (multi-stage resolution)."""
+    # Stage 0: Handle dotted base class names (e.g., pydantic.BaseModel)
+    if "." in base:
+        parts = base.split(".")
+        if len(parts) == 2:
+            # Simple case: module.Class -> import module
+            return f"import {parts[0]}"
+        # Deeper path: a.b.Class -> import a.b
+        module_path = ".".join(parts[:-1])
+        return f"import {module_path}"
+
+    # Stage 1: Check KNOWN_BASE_IMPORTS
+    if base in KNOWN_BASE_IMPORTS:
+        return KNOWN_BASE_IMPORTS[base]  # None means builtin, no import needed
+
+    # Stage 2: Check type_module_map (base defined elsewhere in spec)
+    if type_module_map and base in type_module_map:
+        base_module = type_module_map[base]
+        if base_module != current_module:
+            return f"from {base_module} import {base}"
+        return None
+
+    # Stage 3: Check if base is a known stdlib type (e.g., Pattern, Iterator)
+    if base in STDLIB_TYPE_IMPORTS:
+        return STDLIB_TYPE_IMPORTS[base]
+
+    # Stage 4: Infer from naming conventions
+    # e.g., EventBase -> events module, LayoutMixin -> layout module
+    if base.endswith("Base") or base.endswith("Mixin"):
+        # Extract the prefix and try to find a matching module
+        prefix = base[:-4] if base.endswith("Base") else base[:-5]
+        prefix_lower = prefix.lower()
+        # Check if any module path ends with this prefix
+        if type_module_map:
+            for mod_path in set(type_module_map.values()):
+                mod_name = mod_path.rsplit(".", 1)[-1]
+                if mod_name == prefix_lower or mod_name.startswith(prefix_lower):
+                    # Skip self-imports (Issue 4 fix)
+                    if mod_path != current_module:
+                        return f"from {mod_path} import {base}"
+                    return None
+
+    # Stage 5: Unresolved base - will need manual import (no warning here, just skip)
+    return None
+
+
+def _decorator_import(dec: str | dict[str, Any]) -> str | None:
+    """Return the import statement a decorator needs, if any."""
+    if isinstance(dec, str):
+        # Simple string decorator
+        if dec in STDLIB_DECORATOR_IMPORTS:
+            return f"from {STDLIB_DECORATOR_IMPORTS[dec]} import {dec}"
+        return None
+
+    # DecoratorSpec dict
+    name = dec.get("name", "")
+    import_from = dec.get("import_from")
+    root = name.split(".")[0]
+
+    if import_from:
+        # Explicit import_from: from {import_from} import {root}
+        return f"from {import_from} import {root}"
+    if "." in name:
+        # Dotted name without import_from: import {root}
+        return f"import {root}"
+    if name in STDLIB_DECORATOR_IMPORTS:
+        # Known stdlib decorator
+        return f"from {STDLIB_DECORATOR_IMPORTS[name]} import {name}"
+    # else: assume it's builtin or already imported
+    return None
+
+
 def collect_imports(
     content: ModuleContent,
     type_module_map: dict[str, str] | None = None,
@@ -1302,6 +1449,9 @@ def collect_imports(
     Returns ImportResult with runtime and type_only import lists.
     Runtime imports are needed at module load time (base classes, decorators, defaults).
     Type-only imports are only needed for type checking and go in TYPE_CHECKING blocks.
+
+    Types and functions are each walked once; everything the imports depend
+    on is gathered in that walk and turned into import statements afterwards.
     """
     runtime_imports: set[str] = set()
     type_only_imports: set[str] = set()
@@ -1309,143 +1459,135 @@ def collect_imports(
     runtime_imports.add("from __future__ import annotations")
 
     # Track types defined locally to avoid importing them
-    local_type_names = {t.get("name") for t in content.types if t.get("name")}
-
-    # Track types used in default values (these need runtime imports)
-    runtime_types: set[str] = set()
-
-    # Check for type aliases that need TypeAlias import (runtime - used in assignment)
-    has_type_alias = any(t.get("kind") == "type_alias" for t in content.types)
-    if has_type_alias:
-        runtime_imports.add("from typing import TypeAlias")
+    local_type_names: set[str] = set()
+    kinds: set[str | None] = set()
+    generic_param_kinds: set[str] = set()
+    has_generic_class = False
+    # Whether a pydantic model / dataclass needs Field / field for its defaults
+    pydantic_needs_field = False
+    dataclass_needs_field = False
+    all_sigs: list[str] = []  # Function and method signatures (annotations)
+    all_types: list[str] = []  # Property types (annotations)
+    defaults: list[str] = []  # Parameter defaults (evaluated at runtime)
 
-    # Scan type alias targets for types that need imports (runtime - evaluated at module load)
     for typ in content.types:
-        if typ.get("kind") == "type_alias":
+        kind = typ.get("kind")
+        kinds.add(kind)
+        if typ.get("name"):
+            local_type_names.add(typ["name"])
+
+        # Scan type alias targets for types that need imports (runtime - evaluated at load)
+        if kind == "type_alias":
             target_type = typ.get("type_target") or typ.get("target", "")
             # Check for stdlib types in the target
-            for pattern, import_stmt in STDLIB_TYPE_IMPORTS.items():
-                if re.search(pattern, target_type):
-                    runtime_imports.add(import_stmt)
+            runtime_imports.update(_stdlib_imports_for(target_type))
             # Check for pydantic Field in type alias (e.g., Annotated[..., Field(...)])
-            if re.search(r"\bField\b", target_type):
+            if _FIELD_WORD_RE.search(target_type):
                 # Import Field for runtime use in Annotated
                 runtime_imports.add("from pydantic import Field")
             # Collect referenced types for cross-module imports
             if type_module_map:
-                for type_name in re.findall(r"\b([A-Z][A-Za-z0-9]+)\b", target_type):
+                for type_name in _CAP_NAME_RE.findall(target_type):
                     if type_name in type_module_map and type_module_map[type_name] != current_module:
                         source_module = type_module_map[type_name]
                         # Type aliases need runtime imports since they're evaluated
                         runtime_imports.add(f"from {source_module} import {type_name}")
 
-    has_dataclass = any(t.get("kind") == "dataclass" for t in content.types)
+        # Collect generic_params (TypeVar, ParamSpec, TypeVarTuple)
+        generic_params = typ.get("generic_params", [])
+        if generic_params:
+            # Any non-protocol class with generic_params needs a Generic base
+            if kind not in ("protocol", "type_alias", "enum"):
+                has_generic_class = True
+            generic_param_kinds.update(_generic_param_kind(p) for p in generic_params)
+
+        properties = typ.get("properties", [])
+        all_types.extend(prop.get("type", "") for prop in properties)
+        if use_pydantic:
+            if not pydantic_needs_field and kind != "enum":
+                pydantic_needs_field = any(
+                    prop.get("description") or prop.get("constraints") or _has_literal_default(prop)
+                    for prop in properties
+                )
+        elif not dataclass_needs_field and kind == "dataclass":
+            dataclass_needs_field = any(
+                _has_literal_default(prop) or _is_ctor_call(prop.get("default") or "")
+                for prop in properties
+            )
+
+        # Collect signatures from all method types (Issues 6 & 7 fix)
+        for method_key in ("methods", "class_methods", "static_methods"):
+            for method in typ.get(method_key, []):
+                all_sigs.append(method.get("signature", ""))
+                defaults.extend(param.get("default", "") for param in method.get("parameters", []))
+
+        # Collect base class imports - always runtime
+        bases = typ.get("bases", [])
+        for base in bases:
+            import_stmt = _base_class_import(base, type_module_map, current_module)
+            if import_stmt:
+                runtime_imports.add(import_stmt)
+
+        # Check if types with dotted pydantic bases need Field import
+        # (e.g., class Foo(pydantic.BaseModel): x: str = Field(...))
+        # Also handles pydantic_settings.BaseSettings and similar.
+        # Field is used when there's a description, constraints, or any default value
+        if any(
+            "." in base and base.split(".")[0] in ("pydantic", "pydantic_settings")
+            for base in bases
+        ) and any(
+            prop.get("description") or prop.get("constraints") or prop.get("default") is not None
+            for prop in properties
+        ):
+            runtime_imports.add("from pydantic import Field")
+
+    for func in content.functions:
+        kind = func.get("kind")
+        if kind == "context_manager":
+            runtime_imports.add("from contextlib import contextmanager")
+        elif kind == "async_context_manager":
+            runtime_imports.add("from contextlib import asynccontextmanager")
+
+        generic_param_kinds.update(
+            _generic_param_kind(p) for p in func.get("generic_params", [])
+        )
+        all_sigs.append(func.get("signature", ""))
+        defaults.extend(param.get("default", "") for param in func.get("parameters", []))
+
+        # Collect decorator imports - always runtime
+        for dec in func.get("decorators", []):
+            import_stmt = _decorator_import(dec)
+            if import_stmt:
+                runtime_imports.add(import_stmt)
+
+    # Check for type aliases that need TypeAlias import (runtime - used in assignment)
+    if "type_alias" in kinds:
+        runtime_imports.add("from typing import TypeAlias")
+
+    has_dataclass = "dataclass" in kinds
     # kind="class" types also use pydantic BaseModel with Field() for properties
-    has_pydantic_class = any(
-        t.get("kind") in ("class", "model", None) for t in content.types
-    )
+    has_pydantic_class = not kinds.isdisjoint(("class", "model", None))
 
     # Framework imports are always runtime (used in class definitions)
     if use_pydantic and (has_dataclass or has_pydantic_class):
-        needs_field = False
-        for typ in content.types:
-            if typ.get("kind") == "enum":
-                continue
-            for prop in typ.get("properties", []):
-                if prop.get("description") or prop.get("constraints"):
-                    needs_field = True
-                    break
-                default = prop.get("default", "")
-                if (
-                    default in ("[]", "{}", "set()")
-                    or default.startswith("[")
-                    or default.startswith("{")
-                ):
-                    needs_field = True
-                    break
-            if needs_field:
-                break
-
-        if needs_field:
+        if pydantic_needs_field:
             runtime_imports.add("from pydantic import BaseModel, Field")
         else:
             runtime_imports.add("from pydantic import BaseModel")
-
     elif has_dataclass:
-        needs_field = False
-        for typ in content.types:
-            if typ.get("kind") != "dataclass":
-                continue
-            for prop in typ.get("properties", []):
-                default = prop.get("default", "")
-                if (
-                    default in ("[]", "{}", "set()")
-                    or default.startswith("[")
-                    or default.startswith("{")
-                ):
-                    needs_field = True
-                    break
-                if re.match(r"^[A-Z][a-zA-Z0-9]*\(\)$", default):
-                    needs_field = True
-                    break
-            if needs_field:
-                break
-
-        if needs_field:
+        if dataclass_needs_field:
             runtime_imports.add("from dataclasses import dataclass, field")
         else:
             runtime_imports.add("from dataclasses import dataclass")
 
-    has_enum = any(t.get("kind") == "enum" for t in content.types)
-    if has_enum:
+    if "enum" in kinds:
         runtime_imports.add("import enum")
-
-    has_context_manager = any(
-        f.get("kind") == "context_manager" for f in content.functions
-    )
-    has_async_context_manager = any(
-        f.get("kind") == "async_context_manager" for f in content.functions
-    )
-    if has_context_manager:
-        runtime_imports.add("from contextlib import contextmanager")
-    if has_async_context_manager:
-        runtime_imports.add("from contextlib import asynccontextmanager")
-
-    has_protocol = any(t.get("kind") == "protocol" for t in content.types)
-    if has_protocol:
+    if "protocol" in kinds:
         runtime_imports.add("from typing import Protocol")
-
-    # Check if any non-protocol class has generic_params (needs Generic base)
-    has_generic_class = any(
-        t.get("generic_params")
-        and t.get("kind") not in ("protocol", "type_alias", "enum")
-        for t in content.types
-    )
     if has_generic_class:
         runtime_imports.add("from typing import Generic")
 
-    # Collect imports for generic_params (TypeVar, ParamSpec, TypeVarTuple)
     # These are runtime because they're assigned at module level
-    generic_param_kinds: set[str] = set()
-    for typ in content.types:
-        for param in typ.get("generic_params", []):
-            kind = param.get("kind", "type_var")
-            bound = param.get("bound")
-            # Handle deprecated bound="ParamSpec" pattern (Issue 1 fix)
-            if kind == "type_var" and bound == "ParamSpec":
-                generic_param_kinds.add("param_spec")
-            else:
-                generic_param_kinds.add(kind)
-    for func in content.functions:
-        for param in func.get("generic_params", []):
-            kind = param.get("kind", "type_var")
-            bound = param.get("bound")
-            # Handle deprecated bound="ParamSpec" pattern (Issue 1 fix)
-            if kind == "type_var" and bound == "ParamSpec":
-                generic_param_kinds.add("param_spec")
-            else:
-                generic_param_kinds.add(kind)
-
     if "type_var" in generic_param_kinds:
         runtime_imports.add("from typing import TypeVar")
     if "param_spec" in generic_param_kinds:
@@ -1453,16 +1595,6 @@ def collect_imports(
     if "type_var_tuple" in generic_param_kinds:
         runtime_imports.add("from typing import TypeVarTuple")
 
-    all_sigs = [f.get("signature", "") for f in content.functions]
-    for typ in content.types:
-        # Collect signatures from all method types (Issues 6 & 7 fix)
-        for method_key in ("methods", "class_methods", "static_methods"):
-            for method in typ.get(method_key, []):
-                all_sigs.append(method.get("signature", ""))
-    all_types = [
-        t.get("type", "")
-        for t in sum([typ.get("properties", []) for typ in content.types], [])
-    ]
     combined = " ".join(all_sigs + all_types)
 
     # Stdlib type imports are type-only (only used in annotations with PEP 563)
@@ -1470,50 +1602,22 @@ def collect_imports(
         type_only_imports.add("from typing import Any")
 
     # Check for known stdlib types - these are type-only
-    for pattern, import_stmt in STDLIB_TYPE_IMPORTS.items():
-        if re.search(pattern, combined):
-            type_only_imports.add(import_stmt)
+    type_only_imports.update(_stdlib_imports_for(combined))
 
     if type_module_map:
-        referenced_types = set()  # Types used in annotations
-        runtime_types: set[str] = set()  # Types used in defaults (need runtime import)
-
-        for func in content.functions:
-            sig = func.get("signature", "")
-            for word in re.findall(r"\b([A-Z][a-zA-Z0-9]*)\b", sig):
-                if word in type_module_map:
-                    referenced_types.add(word)
-            # Scan parameter defaults for type references (runtime evaluation)
-            # Handles cases like: priority: Priority = Priority.NORMAL
-            for param in func.get("parameters", []):
-                default = param.get("default", "")
-                if default and default not in ("REQUIRED", "None", "True", "False"):
-                    for word in re.findall(r"\b([A-Z][a-zA-Z0-9]*)\b", default):
-                        if word in type_module_map:
-                            referenced_types.add(word)
-                            runtime_types.add(word)  # Used in default = runtime
-
-        for typ in content.types:
-            for prop in typ.get("properties", []):
-                prop_type = prop.get("type", "")
-                for word in re.findall(r"\b([A-Z][a-zA-Z0-9]*)\b", prop_type):
-                    if word in type_module_map:
-                        referenced_types.add(word)
-            # Also scan method signatures for type references (Issues 6 & 7 fix)
-            for method_key in ("methods", "class_methods", "static_methods"):
-                for method in typ.get(method_key, []):
-                    sig = method.get("signature", "")
-                    for word in re.findall(r"\b([A-Z][a-zA-Z0-9]*)\b", sig):
-                        if word in type_module_map:
-                            referenced_types.add(word)
-                    # Scan method parameter defaults for type references
-                    for param in method.get("parameters", []):
-                        default = param.get("default", "")
-                        if default and default not in ("REQUIRED", "None", "True", "False"):
-                            for word in re.findall(r"\b([A-Z][a-zA-Z0-9]*)\b", default):
-                                if word in type_module_map:
-                                    referenced_types.add(word)
-                                    runtime_types.add(word)  # Used in default = runtime
+        # Types used in annotations: all signatures and property types, scanned at once
+        referenced_types = set(_CAP_IDENT_RE.findall(combined)) & type_module_map.keys()
+
+        # Function and method parameter defaults are evaluated at runtime
+        # Handles cases like: priority: Priority = Priority.NORMAL
+        runtime_defaults = " ".join(
+            default
+            for default in defaults
+            if default and default not in ("REQUIRED", "None", "True", "False")
+        )
+        # Types used in defaults (need runtime import)
+        runtime_types = set(_CAP_IDENT_RE.findall(runtime_defaults)) & type_module_map.keys()
+        referenced_types |= runtime_types
 
         # Separate imports into runtime and type-only based on usage
         runtime_module_imports: dict[str, list[str]] = defaultdict(list)
@@ -1538,110 +1642,6 @@ def collect_imports(
             names_str = ", ".join(sorted(names))
             type_only_imports.add(f"from {mod} import {names_str}")
 
-    # Collect base class imports (multi-stage resolution) - always runtime
-    for typ in content.types:
-        for base in typ.get("bases", []):
-            # Stage 0: Handle dotted base class names (e.g., pydantic.BaseModel)
-            if "." in base:
-                parts = base.split(".")
-                if len(parts) == 2:
-                    # Simple case: module.Class -> import module
-                    runtime_imports.add(f"import {parts[0]}")
-                else:
-                    # Deeper path: a.b.Class -> import a.b
-                    module_path = ".".join(parts[:-1])
-                    runtime_imports.add(f"import {module_path}")
-                continue
-
-            # Stage 1: Check KNOWN_BASE_IMPORTS
-            if base in KNOWN_BASE_IMPORTS:
-                import_stmt = KNOWN_BASE_IMPORTS[base]
-                if import_stmt:  # None means builtin, no import needed
-                    runtime_imports.add(import_stmt)
-                continue
-
-            # Stage 2: Check type_module_map (base defined elsewhere in spec)
-            if type_module_map and base in type_module_map:
-                base_module = type_module_map[base]
-                if base_module != current_module:
-                    runtime_imports.add(f"from {base_module} import {base}")
-                continue
-
-            # Stage 3: Check if base matches a stdlib pattern (e.g., Pattern, Iterator)
-            found_stdlib = False
-            for pattern, import_stmt in STDLIB_TYPE_IMPORTS.items():
-                if re.match(pattern.replace(r"\b", "^") + "$", base):
-                    runtime_imports.add(import_stmt)
-                    found_stdlib = True
-                    break
-            if found_stdlib:
-                continue
-
-            # Stage 4: Infer from naming conventions
-            # e.g., EventBase -> events module, LayoutMixin -> layout module
-            if base.endswith("Base") or base.endswith("Mixin"):
-                # Extract the prefix and try to find a matching module
-                prefix = base[:-4] if base.endswith("Base") else base[:-5]
-                prefix_lower = prefix.lower()
-                # Check if any module path ends with this prefix
-                if type_module_map:
-                    for mod_path in set(type_module_map.values()):
-                        mod_name = mod_path.rsplit(".", 1)[-1]
-                        if mod_name == prefix_lower or mod_name.startswith(prefix_lower):
-                            # Skip self-imports (Issue 4 fix)
-                            if mod_path != current_module:
-                                runtime_imports.add(f"from {mod_path} import {base}")
-                            break
-
-            # Stage 5: Unresolved base - will need manual import (no warning here, just skip)
-
-    # Check if types with dotted pydantic bases need Field import
-    # (e.g., class Foo(pydantic.BaseModel): x: str = Field(...))
-    # Also handles pydantic_settings.BaseSettings and similar
-    for typ in content.types:
-        has_dotted_pydantic_base = any(
-            "." in base and base.split(".")[0] in ("pydantic", "pydantic_settings")
-            for base in typ.get("bases", [])
-        )
-        if has_dotted_pydantic_base:
-            # Check if this type needs Field - Field is used when there's
-            # a description, constraints, or any default value
-            for prop in typ.get("properties", []):
-                if prop.get("description") or prop.get("constraints"):
-                    runtime_imports.add("from pydantic import Field")
-                    break
-                default = prop.get("default")
-                if default is not None:
-                    # Any default triggers Field(default=...) generation
-                    runtime_imports.add("from pydantic import Field")
-                    break
-
-    # Collect decorator imports - always runtime
-    for func in content.functions:
-        for dec in func.get("decorators", []):
-            if isinstance(dec, str):
-                # Simple string decorator
-                if dec in STDLIB_DECORATOR_IMPORTS:
-                    module = STDLIB_DECORATOR_IMPORTS[dec]
-                    runtime_imports.add(f"from {module} import {dec}")
-            else:
-                # DecoratorSpec dict
-                name = dec.get("name", "")
-                import_from = dec.get("import_from")
-                root = name.split(".")[0]
-
-                if import_from:
-                    # Explicit import_from: from {import_from} import {root}
-                    runtime_imports.add(f"from {import_from} import {root}")
-                elif "." in name:
-                    # Dotted name without import_from: import {root}
-                    runtime_imports.add(f"import {root}")
-                elif name in STDLIB_DECORATOR_IMPORTS:
-                    # Known stdlib decorator
-                    module = STDLIB_DECORATOR_IMPORTS[name]
-                    runtime_imports.add(f"from {module} import {name}")
-                # else: assume it's builtin or already imported
-
     # Add TYPE_CHECKING import if we have type-only imports
     if type_only_imports:
         runtime_imports.add("from typing import TYPE_CHECKING")
@@ -1692,19 +1692,63 @@ def generate_type_var_ast(param: dict) -> tuple[ast.Assign, dict[str, str]]:
         A tuple of (AST node, rename mapping) where rename mapping is empty if
         no rename occurred, or {original_name: new_name} if the TypeVar was renamed.
     """
-    name = param["name"]
+    node, renames = _type_var_ast(param)
+    return copy.deepcopy(node), renames
+
+
+def _type_var_ast(param: dict) -> tuple[ast.Assign, dict[str, str]]:
+    """Like generate_type_var_ast, but return the shared cached node; never mutate it."""
+    node, renames, warnings = _build_type_var(*_type_var_key(param))
+    for warning in warnings:
+        click.secho(warning, fg="yellow", err=True)
+    return node, dict(renames)
+
+
+def _type_var_key(
+    param: dict[str, Any],
+) -> tuple[str, str, str | None, tuple[str, ...], str, str | None]:
+    """Return the hashable fields a type variable definition is built from."""
+    return (
+        param["name"],
+        param.get("kind", "type_var"),
+        param.get("bound"),
+        tuple(param.get("constraints", ())),
+        param.get("variance", "invariant"),
+        param.get("default"),
+    )
+
+
+@lru_cache(maxsize=256)
+def _type_var_source(key: tuple[str, str, str | None, tuple[str, ...], str, str | None]) -> str:
+    """Return the source line for a type variable definition."""
+    module = ast.Module(body=[_build_type_var(*key)[0]], type_ignores=[])
+    _set_statement_lines(module.body)
+    return ast.unparse(module)
+
+
+@lru_cache(maxsize=256)
+def _build_type_var(
+    name: str,
+    kind: str,
+    bound: str | None,
+    constraints: tuple[str, ...],
+    variance: str,
+    default: str | None,
+) -> tuple[ast.Assign, tuple[tuple[str, str], ...], tuple[str, ...]]:
+    """Build a type variable assignment, its renames and its warnings.
+
+    The same TypeVars (T, K, V, ...) recur across modules, so results are
+    cached; the returned node is shared and must not be modified.
+    """
     original_name = name
-    kind = param.get("kind", "type_var")
-    bound = param.get("bound")
-    rename_map: dict[str, str] = {}
+    renames: list[tuple[str, str]] = []
+    warnings: list[str] = []
 
     # Handle deprecated bound="ParamSpec" pattern (Issue 1 fix)
     if kind == "type_var" and bound == "ParamSpec":
-        click.secho(
+        warnings.append(
             f"Warning: TypeVar '{name}' uses deprecated bound='ParamSpec'. "
-            "Use kind='param_spec' instead.",
-            fg="yellow",
-            err=True,
+            "Use kind='param_spec' instead."
         )
         kind = "param_spec"
         bound = None  # Clear bound since ParamSpec doesn't support bounds
@@ -1722,44 +1766,34 @@ def generate_type_var_ast(param: dict) -> tuple[ast.Assign, dict[str, str]]:
     keywords: list[ast.keyword] = []
 
     if kind == "type_var":
-        # Handle TypeVar-specific arguments
-        bound = param.get("bound")
-        constraints = param.get("constraints", [])
-        variance = param.get("variance", "invariant")
-        default = param.get("default")
-
         # Auto-fix TypeVar naming to follow PEP 8 convention
         if variance == "covariant" and not name.endswith("_co"):
             name = f"{name}_co"
-            click.secho(
+            warnings.append(
                 f"Warning: Covariant TypeVar '{original_name}' renamed to '{name}' "
-                "per PEP 8 naming convention",
-                fg="yellow",
-                err=True,
+                "per PEP 8 naming convention"
             )
             # Update the args to use the new name
             args = [ast.Constant(value=name)]
-            rename_map[original_name] = name
+            renames.append((original_name, name))
         elif variance == "contravariant" and not name.endswith("_contra"):
             name = f"{name}_contra"
-            click.secho(
+            warnings.append(
                 f"Warning: Contravariant TypeVar '{original_name}' renamed to '{name}' "
-                "per PEP 8 naming convention",
-                fg="yellow",
-                err=True,
+                "per PEP 8 naming convention"
             )
             # Update the args to use the new name
             args = [ast.Constant(value=name)]
-            rename_map[original_name] = name
+            renames.append((original_name, name))
 
         # Add constraints as positional arguments (TypeVar("T", int, str))
         for constraint in constraints:
-            args.append(ast.Name(id=constraint, ctx=ast.Load()))
+            args.append(_name(constraint))
 
         # Add bound as keyword argument
         if bound:
             keywords.append(
-                ast.keyword(arg="bound", value=ast.Name(id=bound, ctx=ast.Load()))
+                ast.keyword(arg="bound", value=_name(bound))
             )
 
         # Add variance
@@ -1775,29 +1809,26 @@ def generate_type_var_ast(param: dict) -> tuple[ast.Assign, dict[str, str]]:
         # Add default (Python 3.13+)
         if default:
             keywords.append(
-                ast.keyword(arg="default", value=ast.Name(id=default, ctx=ast.Load()))
+                ast.keyword(arg="default", value=_name(default))
             )
 
     elif kind in ("param_spec", "type_var_tuple"):
         # ParamSpec and TypeVarTuple only support default (Python 3.13+)
-        default = param.get("default")
         if default:
             keywords.append(
-                ast.keyword(arg="default", value=ast.Name(id=default, ctx=ast.Load()))
+                ast.keyword(arg="default", value=_name(default))
             )
 
     # Create the assignment: T = TypeVar("T", ...)
-    return (
-        ast.Assign(
-            targets=[ast.Name(id=name, ctx=ast.Store())],
-            value=ast.Call(
-                func=ast.Name(id=constructor, ctx=ast.Load()),
-                args=args,
-                keywords=keywords,
-            ),
+    node = ast.Assign(
+        targets=[ast.Name(id=name, ctx=_STORE)],
+        value=ast.Call(
+            func=_name(constructor),
+            args=args,
+            keywords=keywords,
         ),
-        rename_map,
     )
+    return node, tuple(renames), tuple(warnings)
 
 
 def _apply_typevar_renames(code: str, renames: dict[str, str]) -> str:
@@ -1806,8 +1837,7 @@ def _apply_typevar_renames(code: str, renames: dict[str, str]) -> str:
     Uses word-boundary matching to replace type references without affecting
     the TypeVar declaration itself or other occurrences.
     """
-    import re
-
+    patterns = [(_word_re(original), renamed) for original, renamed in renames.items()]
     lines = code.split("\n")
     result_lines = []
 
@@ -1817,11 +1847,10 @@ def _apply_typevar_renames(code: str, renames: dict[str, str]) -> str:
             result_lines.append(line)
             continue
 
-        for original, renamed in renames.items():
+        for pattern, renamed in patterns:
             # Match the type name as a word boundary
             # Handles: T, T], T[, T,, T), T|, -> T, etc.
-            pattern = rf"\b{re.escape(original)}\b"
-            line = re.sub(pattern, renamed, line)
+            line = pattern.sub(renamed, line)
         result_lines.append(line)
 
     return "\n".join(result_lines)
@@ -1855,7 +1884,7 @@ def _topological_sort_types(types: list[dict]) -> list[dict]:
             if "." in base:
                 continue
             # Strip generic parameters: Handle[T] -> Handle
-            base_name = re.sub(r"\[.*\]$", "", base)
+            base_name = _GENERIC_SUFFIX_RE.sub("", base)
             if base_name in local_names and base_name != name:
                 dependencies[name].add(base_name)
 
@@ -1863,7 +1892,7 @@ def _topological_sort_types(types: list[dict]) -> list[dict]:
         if typ.get("kind") == "type_alias":
             target = typ.get("type_target") or typ.get("target", "")
             # Extract type names from target (capitalized words)
-            for word in re.findall(r"\b([A-Z][a-zA-Z0-9]*)\b", target):
+            for word in _CAP_IDENT_RE.findall(target):
                 if word in local_names and word != name:
                     dependencies[name].add(word)
 
@@ -1935,7 +1964,7 @@ def _topological_sort_types(types: list[dict]) -> list[dict]:
 
 
 def generate_module_header(module_path: str, spec: dict | None = None) -> str:
-    """Generate module header docstring with description."""
+    """Generate the module docstring, as source text, with the module description."""
     lines = [f"Generated stubs for {module_path}."]
 
     if spec:
@@ -1946,7 +1975,8 @@ def generate_module_header(module_path: str, spec: dict | None = None) -> str:
                 desc = mod.get("description")
                 if desc:
                     lines.append("")
-                    lines.append(desc)
+                    # Keep backslashes literal inside the docstring
+                    lines.append(desc.replace("\\", "\\\\"))
                 break
 
     lines.append("")
@@ -1955,6 +1985,20 @@ def generate_module_header(module_path: str, spec: dict | None = None) -> str:
     return '"""' + "\n".join(lines) + '\n"""'
 
 
+def _set_statement_lines(body: list[ast.stmt]) -> None:
+    """Give generated statements the line number ast.unparse looks up.
+
+    The tree is only unparsed, never compiled, and ast.unparse reads lineno
+    on statements alone (to find type: ignore comments). Numbering just the
+    statements is much cheaper than ast.fix_missing_locations, which visits
+    every expression node as well.
+    """
+    for stmt in body:
+        stmt.lineno = 1
+        if isinstance(stmt, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef, ast.If)):
+            _set_statement_lines(stmt.body)
+
+
 def generate_module_code(
     module_path: str,
     content: ModuleContent,
@@ -1963,40 +2007,24 @@ def generate_module_code(
     spec: dict | None = None,
 ) -> str:
     """Generate complete Python code for a module."""
-    body: list[ast.stmt] = []
-
-    mod_docstring = generate_module_header(module_path, spec)
-    body.append(ast.Expr(value=ast.Constant(value=mod_docstring)))
+    # The header is already docstring source text, so it goes in verbatim
+    head_lines = [generate_module_header(module_path, spec)]
 
     import_result = collect_imports(content, type_module_map, module_path, use_pydantic)
 
-    # Add runtime imports
-    for imp in import_result.runtime:
-        try:
-            imp_ast = ast.parse(imp).body[0]
-            body.append(imp_ast)
-        except SyntaxError:
-            pass
+    # Imports are already source text, so they are emitted as-is rather than
+    # parsed into the tree only to be unparsed again
+    head_lines.extend(imp for imp in import_result.runtime if _is_import_statement(imp))
 
     # Add TYPE_CHECKING block with type-only imports
-    if import_result.type_only:
-        type_check_body: list[ast.stmt] = []
-        for imp in import_result.type_only:
-            try:
-                imp_ast = ast.parse(imp).body[0]
-                type_check_body.append(imp_ast)
-            except SyntaxError:
-                pass
-
-        if type_check_body:
-            # if TYPE_CHECKING:
-            #     from x import Y
-            type_check_if = ast.If(
-                test=ast.Name(id="TYPE_CHECKING", ctx=ast.Load()),
-                body=type_check_body,
-                orelse=[],
-            )
-            body.append(type_check_if)
+    type_check_lines = [
+        f"    {imp}" for imp in import_result.type_only if _is_import_statement(imp)
+    ]
+    if type_check_lines:
+        # if TYPE_CHECKING:
+        #     from x import Y
+        head_lines.append("if TYPE_CHECKING:")
+        head_lines.extend(type_check_lines)
 
     # Generate __all__ for module exports
     all_names: list[str] = []
@@ -2008,14 +2036,7 @@ def generate_module_code(
             all_names.append(func["name"])
 
     if all_names:
-        all_assign = ast.Assign(
-            targets=[ast.Name(id="__all__", ctx=ast.Store())],
-            value=ast.List(
-                elts=[ast.Constant(value=name) for name in sorted(all_names)],
-                ctx=ast.Load(),
-            ),
-        )
-        body.append(all_assign)
+        head_lines.append(f"__all__ = {sorted(all_names)!r}")
 
     # Generate type variable definitions after imports
     # Track TypeVar renames for reference updates
@@ -2035,13 +2056,16 @@ def generate_module_code(
     conflicting_names = {name for name, variances in names_by_variance.items() if len(variances) > 1}
 
     for param in generic_params:
-        typevar_ast, renames = generate_type_var_ast(param)
-        body.append(typevar_ast)
+        # Definitions repeat across modules, so their source lines are cached
+        _, renames = _type_var_ast(param)
+        head_lines.append(_type_var_source(_type_var_key(param)))
         # Only add renames for TypeVars that don't have conflicting variances
         for original, renamed in renames.items():
             if original not in conflicting_names:
                 typevar_renames[original] = renamed
 
+    body: list[ast.stmt] = []
+
     # Topologically sort types so dependencies come first
     # Dependencies: base classes must precede derived classes, types must precede type aliases that reference them
     sorted_types = _topological_sort_types(content.types)
@@ -2055,59 +2079,32 @@ def generate_module_code(
         if func.get("notes"):
             function_notes[func["name"]] = func["notes"]
 
-    module = ast.Module(body=body, type_ignores=[])
-    ast.fix_missing_locations(module)
+    code = "\n".join(head_lines)
+    if body:
+        module = ast.Module(body=body, type_ignores=[])
+        _set_statement_lines(module.body)
+        # ast.unparse puts a blank line before each def/class except the first
+        # statement; this one follows the imports, so restore it here
+        blank = isinstance(body[0], (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
+        code += ("\n\n" if blank else "\n") + ast.unparse(module)
 
-    code = ast.unparse(module)
-
-    code = _fix_module_docstring(code)
     code = _insert_function_notes(code, function_notes)
 
     # Apply TypeVar renames to update references throughout the code
     if typevar_renames:
         code = _apply_typevar_renames(code, typevar_renames)
 
-    lines = code.split("\n")
-    cleaned = []
-    for line in lines:
-        if line.strip() == "pass" and len(cleaned) > 0:
-            prev_stripped = cleaned[-1].strip()
-            # Skip standalone pass after these patterns (not inside class/function bodies)
-            if (
-                prev_stripped.endswith('"""')
-                or prev_stripped.startswith("from ")
-                or prev_stripped.startswith("import ")
-                or prev_stripped.endswith("]")  # After __all__ = [...]
-            ):
-                cleaned.append("")
-                continue
-        cleaned.append(line)
-
-    return "\n".join(cleaned)
-
-
-def _fix_module_docstring(code: str) -> str:
-    """Fix module docstring that gets double-quoted by ast.unparse."""
-    lines = code.split("\n")
-    if not lines:
-        return code
+    return code
 
-    first_line = lines[0]
-    if first_line.startswith("'") or first_line.startswith('"'):
-        if first_line.startswith("'\"\"\"") or first_line.startswith('\'"""'):
-            lines[0] = first_line[1:]
-            for i, line in enumerate(lines):
-                if line.rstrip().endswith("\"\"\"'"):
-                    lines[i] = line.rstrip()[:-1]
-                    break
-        elif first_line.startswith("'''\"\"\""):
-            lines[0] = first_line[3:]
-            for i, line in enumerate(lines):
-                if line.rstrip().endswith("\"\"\"'''"):
-                    lines[i] = line.rstrip()[:-3]
-                    break
 
-    return "\n".join(lines)
+@lru_cache(maxsize=1024)
+def _is_import_statement(statement: str) -> bool:
+    """Check that a collected import is valid Python; invalid ones are dropped."""
+    try:
+        ast.parse(statement)
+    except SyntaxError:
+        return False
+    return True
 
 
 def _insert_function_notes(code: str, function_notes: dict[str, str]) -> str:
@@ -2115,38 +2112,20 @@ def _insert_function_notes(code: str, function_notes: dict[str, str]) -> str:
     if not function_notes:
         return code
 
-    lines = code.split("\n")
     result = []
-    i = 0
-
-    while i < len(lines):
-        line = lines[i]
-
+    for line in code.split("\n"):
         # Look for: raise NotImplementedError("func_name not implemented")
-        # ast.unparse may use single or double quotes
-        stripped = line.strip()
-        if stripped.startswith("raise NotImplementedError("):
-            # Extract function name from the error message
-            for func_name, notes in function_notes.items():
-                # Check both quote styles
-                if (
-                    f'"{func_name} not implemented"' in stripped
-                    or f"'{func_name} not implemented'" in stripped
-                ):
-                    # Get indentation from current line
-                    indent = line[: len(line) - len(line.lstrip())]
-
-                    # Format notes as comments
-                    result.append(f"{indent}# Implementation notes:")
-                    for note_line in notes.split("\n"):
-                        if note_line.strip():
-                            result.append(f"{indent}# {note_line}")
-                        else:
-                            result.append(f"{indent}#")
-                    break
-
+        match = _NOT_IMPLEMENTED_RAISE_RE.match(line)
+        if match and match.group(2) in function_notes:
+            indent = match.group(1)
+            # Format notes as comments
+            result.append(f"{indent}# Implementation notes:")
+            for note_line in function_notes[match.group(2)].split("\n"):
+                if note_line.strip():
+                    result.append(f"{indent}# {note_line}")
+                else:
+                    result.append(f"{indent}#")
         result.append(line)
-        i += 1
 
     return "\n".join(result)
 
@@ -2162,23 +2141,14 @@ def build_import_graph(
     graph: dict[str, set[str]] = {mod: set() for mod in modules}
 
     for module_path, content in modules.items():
-        imported_modules: set[str] = set()
-
-        # Check type references in signatures and properties
-        for func in content.functions:
-            sig = func.get("signature", "")
-            for word in re.findall(r"\b([A-Z][a-zA-Z0-9]*)\b", sig):
-                if word in type_module_map:
-                    imported_modules.add(type_module_map[word])
-
+        # Check type references in signatures and properties, scanned in one pass
+        annotations = [func.get("signature", "") for func in content.functions]
         for typ in content.types:
-            # Check property types
-            for prop in typ.get("properties", []):
-                prop_type = prop.get("type", "")
-                for word in re.findall(r"\b([A-Z][a-zA-Z0-9]*)\b", prop_type):
-                    if word in type_module_map:
-                        imported_modules.add(type_module_map[word])
+            annotations.extend(prop.get("type", "") for prop in typ.get("properties", []))
+        words = set(_CAP_IDENT_RE.findall(" ".join(annotations)))
+        imported_modules = {type_module_map[word] for word in words & type_module_map.keys()}
 
+        for typ in content.types:
             # Check base classes
             for base in typ.get("bases", []):
                 if base in type_module_map:
@@ -2192,38 +2162,77 @@ def build_import_graph(
 
 
 def find_import_cycles(graph: dict[str, set[str]]) -> list[list[str]]:
-    """Find all cycles in the import dependency graph using DFS.
+    """Find circular imports in the import dependency graph.
 
-    Returns a list of cycles, where each cycle is a list of module paths.
+    Uses Tarjan's strongly connected components algorithm, so each group of
+    mutually importing modules (or a module importing itself) is reported
+    once. Each cycle lists its modules in discovery order, starting and
+    ending with the smallest module path.
     """
+    # Number the modules so the traversal works on lists instead of dicts
+    names = list(graph)
+    ids = {name: i for i, name in enumerate(names)}
+    for targets in graph.values():
+        for target in targets:
+            if target not in ids:
+                ids[target] = len(names)
+                names.append(target)
+    adjacency = [[ids[target] for target in graph.get(name, ())] for name in names]
+
+    index = [-1] * len(names)
+    lowlink = [0] * len(names)
+    on_stack = [False] * len(names)
+    component_stack: list[int] = []
+    counter = 0
     cycles: list[list[str]] = []
-    visited: set[str] = set()
-    rec_stack: set[str] = set()
-
-    def dfs(node: str, path: list[str]) -> None:
-        visited.add(node)
-        rec_stack.add(node)
-        path.append(node)
-
-        for neighbor in graph.get(node, set()):
-            if neighbor not in visited:
-                dfs(neighbor, path)
-            elif neighbor in rec_stack:
-                # Found a cycle - extract it
-                cycle_start = path.index(neighbor)
-                cycle = path[cycle_start:] + [neighbor]
-                # Normalize cycle to avoid duplicates (start with smallest element)
-                min_idx = cycle.index(min(cycle[:-1]))
-                normalized = cycle[min_idx:-1] + cycle[:min_idx] + [cycle[min_idx]]
-                if normalized not in cycles:
-                    cycles.append(normalized)
-
-        path.pop()
-        rec_stack.remove(node)
-
-    for node in graph:
-        if node not in visited:
-            dfs(node, [])
+
+    for root in range(len(names)):
+        if index[root] != -1:
+            continue
+
+        # Iterative DFS: each entry is a node and its remaining neighbors
+        index[root] = lowlink[root] = counter
+        counter += 1
+        component_stack.append(root)
+        on_stack[root] = True
+        work = [(root, iter(adjacency[root]))]
+
+        while work:
+            node, neighbors = work[-1]
+            for neighbor in neighbors:
+                if index[neighbor] == -1:
+                    index[neighbor] = lowlink[neighbor] = counter
+                    counter += 1
+                    component_stack.append(neighbor)
+                    on_stack[neighbor] = True
+                    work.append((neighbor, iter(adjacency[neighbor])))
+                    break
+                if on_stack[neighbor] and index[neighbor] < lowlink[node]:
+                    lowlink[node] = index[neighbor]
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if lowlink[node] < lowlink[parent]:
+                        lowlink[parent] = lowlink[node]
+                if lowlink[node] != index[node]:
+                    continue
+
+                # node is the root of a component - pop it off the stack
+                component: list[int] = []
+                while True:
+                    member = component_stack.pop()
+                    on_stack[member] = False
+                    component.append(member)
+                    if member == node:
+                        break
+                if len(component) == 1 and node not in adjacency[node]:
+                    continue
+
+                cycle = [names[member] for member in reversed(component)]
+                # Normalize cycle to start with its smallest element
+                min_idx = cycle.index(min(cycle))
+                cycles.append(cycle[min_idx:] + cycle[:min_idx] + [cycle[min_idx]])
 
     return cycles
 
@@ -2274,16 +2283,16 @@ def find_types_in_cycles(
 
 def _module_references_type(content: ModuleContent, type_name: str) -> bool:
     """Check if a module content references a given type name."""
-    pattern = rf"\b{re.escape(type_name)}\b"
+    pattern = _word_re(type_name)
 
     for func in content.functions:
         sig = func.get("signature", "")
-        if re.search(pattern, sig):
+        if pattern.search(sig):
             return True
 
     for typ in content.types:
         for prop in typ.get("properties", []):
-            if re.search(pattern, prop.get("type", "")):
+            if pattern.search(prop.get("type", "")):
                 return True
         for base in typ.get("bases", []):
             if base == type_name:
@@ -2346,8 +2355,13 @@ def generate_shared_types_code(
     return code
 
 
+@lru_cache(maxsize=4096)
 def format_with_ruff(code: str) -> str:
-    """Format code using ruff."""
+    """Format code using ruff.
+
+    Results are cached, so repeated bodies such as package stubs only start
+    ruff once.
+    """
     try:
         result = subprocess.run(
             ["ruff", "format", "--stdin-filename", "generated.py"],
@@ -2363,6 +2377,238 @@ def format_with_ruff(code: str) -> str:
     return code
 
 
+def _find_ruff_config(start: Path) -> Path | None:
+    """Find the ruff configuration that applies to files under ``start``.
+
+    Mirrors ruff's own discovery: the closest directory with a
+    ``.ruff.toml``, ``ruff.toml`` or a ``pyproject.toml`` that has a
+    ``[tool.ruff]`` table wins.
+    """
+    for directory in (start, *start.parents):
+        for name in (".ruff.toml", "ruff.toml"):
+            candidate = directory / name
+            if candidate.is_file():
+                return candidate
+        pyproject = directory / "pyproject.toml"
+        try:
+            if "[tool.ruff" in pyproject.read_text(encoding="utf-8"):
+                return pyproject
+        except OSError:
+            continue
+    return None
+
+
+def format_all_with_ruff(codes: list[str]) -> list[str]:
+    """Format several files with a single ruff process.
+
+    The files are written to a system temporary directory and the project
+    configuration is passed explicitly, so ruff formats them the same way
+    format_with_ruff does from the working directory. Files ruff cannot
+    format come back unchanged. Identical files are only formatted once.
+    """
+    unique = list(dict.fromkeys(codes))
+    if len(unique) < 2:
+        return [format_with_ruff(code) for code in codes]
+
+    import tempfile
+
+    cmd = ["ruff", "format", "--quiet"]
+    config = _find_ruff_config(Path.cwd())
+    if config is not None:
+        cmd += ["--config", str(config)]
+
+    try:
+        with tempfile.TemporaryDirectory(prefix="libspec-format-") as tmp:
+            paths = [Path(tmp) / f"m{i}.py" for i in range(len(unique))]
+            for path, code in zip(paths, unique):
+                path.write_text(code)
+            subprocess.run(
+                [*cmd, tmp],
+                capture_output=True,
+                timeout=30 * len(unique),
+            )
+            formatted = {code: path.read_text() for code, path in zip(unique, paths)}
+    except (subprocess.SubprocessError, OSError):
+        return codes
+    return [formatted[code] for code in codes]
+
+
+def _generate_module(
+    module_path: str,
+    content: ModuleContent,
+    type_module_map: dict[str, str],
+    use_pydantic: bool,
+    spec: dict[str, Any],
+) -> str:
+    """Generate the unformatted code for one module."""
+    return generate_module_code(
+        module_path,
+        content,
+        type_module_map=type_module_map,
+        use_pydantic=use_pydantic,
+        spec=spec,
+    )
+
+
+# Arguments shared by every module in a worker process, set once by _init_worker
+_worker_args: tuple[dict[str, ModuleContent], dict[str, str], bool, dict[str, Any]] | None = None
+
+
+def _init_worker(
+    modules: dict[str, ModuleContent],
+    type_module_map: dict[str, str],
+    use_pydantic: bool,
+    spec: dict[str, Any],
+) -> None:
+    """Receive the spec once per worker instead of once per module."""
+    global _worker_args
+    _worker_args = (modules, type_module_map, use_pydantic, spec)
+
+
+def _generate_module_in_worker(module_path: str) -> str:
+    """Generate one module inside a worker process."""
+    assert _worker_args is not None
+    modules, type_module_map, use_pydantic, spec = _worker_args
+    return _generate_module(
+        module_path, modules[module_path], type_module_map, use_pydantic, spec
+    )
+
+
+def generate_modules(
+    modules: dict[str, ModuleContent],
+    type_module_map: dict[str, str],
+    use_pydantic: bool,
+    spec: dict[str, Any],
+    format_code: bool,
+    jobs: int = 1,
+) -> list[str]:
+    """Generate code for every module, in the order of ``modules``.
+
+    Modules are independent of each other, so with ``jobs > 1`` they are
+    spread across that many worker processes. Formatting happens afterwards
+    in one ruff run over all modules.
+    """
+    if jobs <= 1 or len(modules) < 2:
+        codes = [
+            _generate_module(module_path, content, type_module_map, use_pydantic, spec)
+            for module_path, content in modules.items()
+        ]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(
+            max_workers=min(jobs, len(modules)),
+            initializer=_init_worker,
+            initargs=(modules, type_module_map, use_pydantic, spec),
+        ) as executor:
+            codes = list(executor.map(_generate_module_in_worker, modules))
+
+    if format_code:
+        codes = format_all_with_ruff(codes)
+    return codes
+
+
+@lru_cache(maxsize=1)
+def _generator_fingerprint() -> str:
+    """Hash the source of this module, so cached output goes stale when codegen changes."""
+    return hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def _formatter_fingerprint() -> str:
+    """Describe the ruff version and configuration that formatting will use."""
+    try:
+        version = subprocess.run(
+            ["ruff", "--version"], capture_output=True, text=True, timeout=30
+        ).stdout.strip()
+    except (subprocess.SubprocessError, OSError):
+        version = ""
+    config = _find_ruff_config(Path.cwd())
+    try:
+        config_text = config.read_text(encoding="utf-8") if config is not None else ""
+    except OSError:
+        config_text = ""
+    return hashlib.sha256(f"{version}\0{config}\0{config_text}".encode()).hexdigest()
+
+
+def _module_cache_key(
+    module_path: str,
+    content: ModuleContent,
+    type_module_map: dict[str, str],
+    use_pydantic: bool,
+    spec: dict[str, Any],
+    format_code: bool,
+) -> str:
+    """Hash everything the generated code for one module depends on.
+
+    The only part of the spec a module reads outside its own entries is its
+    description, which ends up in the header. The generator source is part
+    of the key, and so are the ruff version and configuration when the code
+    is formatted.
+    """
+    payload = {
+        "module": module_path,
+        "functions": content.functions,
+        "types": content.types,
+        "type_module_map": type_module_map,
+        "header": generate_module_header(module_path, spec),
+        "pydantic": use_pydantic,
+        "format": format_code,
+        "version": __version__,
+        "generator": _generator_fingerprint(),
+        "formatter": _formatter_fingerprint() if format_code else None,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def generate_modules_cached(
+    modules: dict[str, ModuleContent],
+    type_module_map: dict[str, str],
+    use_pydantic: bool,
+    spec: dict[str, Any],
+    format_code: bool,
+    cache_dir: Path,
+    jobs: int = 1,
+    dry_run: bool = False,
+) -> tuple[list[str], int]:
+    """Like generate_modules, but reuse code from earlier runs stored in ``cache_dir``.
+
+    Returns the code for every module and the number of modules served
+    from the cache. With ``dry_run`` the cache is only read, never written.
+    Modules served from the cache are not regenerated, so warnings printed
+    during generation (such as TypeVar renames) only appear for the
+    modules that missed.
+    """
+    keys = {
+        module_path: _module_cache_key(
+            module_path, content, type_module_map, use_pydantic, spec, format_code
+        )
+        for module_path, content in modules.items()
+    }
+
+    codes: dict[str, str] = {}
+    for module_path, key in keys.items():
+        try:
+            codes[module_path] = (cache_dir / f"{key}.py").read_text()
+        except FileNotFoundError:
+            pass
+    hits = len(codes)
+
+    missing = {path: content for path, content in modules.items() if path not in codes}
+    if missing:
+        generated = generate_modules(
+            missing, type_module_map, use_pydantic, spec, format_code, jobs
+        )
+        if not dry_run:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+        for module_path, code in zip(missing, generated):
+            if not dry_run:
+                (cache_dir / f"{keys[module_path]}.py").write_text(code)
+            codes[module_path] = code
+
+    return [codes[module_path] for module_path in modules], hits
+
+
 def generate_init_code(
     module_path: str,
     exports: list[str],
@@ -2458,6 +2704,56 @@ def generate_init_code(
     return "\n".join(lines)
 
 
+def _package_dir(package: str, package_dirs: dict[str, Path]) -> Path:
+    """Return the output directory for a dotted package path.
+
+    package_dirs maps already resolved packages to their directories and must
+    contain the output directory under the empty package name.
+    """
+    path = package_dirs.get(package)
+    if path is None:
+        parent, _, name = package.rpartition(".")
+        path = package_dirs[package] = _package_dir(parent, package_dirs) / name
+    return path
+
+
+def _write_generated_file(path: Path, code: str) -> None:
+    """Write one generated file as UTF-8, leaving it untouched if already up to date."""
+    encoded = code.encode("utf-8")
+    try:
+        if path.stat().st_size == len(encoded) and path.read_bytes() == encoded:
+            return
+    except OSError:
+        pass
+
+    data = memoryview(encoded)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        while data:
+            data = data[os.write(fd, data) :]
+    finally:
+        os.close(fd)
+
+
+def _write_generated_files(results: list[GenerationResult]) -> None:
+    """Write generated files to disk, overlapping the writes on a thread pool.
+
+    Output directories are created before any file is written, with one mkdir
+    per deepest directory since that creates its ancestors too. When several
+    results share a path, the last one wins.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    files = {result.path: result.code for result in results if result.path is not None}
+    parents = {path.parent for path in files}
+    ancestors = {ancestor for parent in parents for ancestor in parent.parents}
+    for parent in parents - ancestors:
+        parent.mkdir(parents=True, exist_ok=True)
+
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as pool:
+        list(pool.map(_write_generated_file, files.keys(), files.values()))
+
+
 # === CLI Commands ===
 
 
@@ -2499,6 +2795,18 @@ def generate_init_code(
     is_flag=True,
     help="Skip entities with maturity='implemented' or 'tested'",
 )
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=0),
+    default=1,
+    help="Generate modules in N worker processes; 0 uses one per CPU (default: 1)",
+)
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False),
+    help="Reuse modules generated by earlier runs from this directory",
+)
 @pass_context
 def codegen(
     ctx: Context,
@@ -2509,6 +2817,8 @@ def codegen(
     pydantic: bool,
     list_modules: bool,
     skip_implemented: bool,
+    jobs: int,
+    cache_dir: str | None,
 ) -> None:
     """
     Generate Python stubs from libspec.json.
@@ -2526,12 +2836,17 @@ def codegen(
         libspec codegen -m mylib.server          # One module to stdout
         libspec codegen --pydantic -o generated/ # Use Pydantic models
         libspec codegen --dry-run                # Preview all files to stdout
+        libspec codegen -j 8 -o src/             # Generate with 8 processes
+        libspec codegen -j 0 -o src/             # One process per CPU
+        libspec codegen --cache-dir .libspec-cache -o src/  # Skip unchanged modules
     """
     loaded = ctx.get_spec()
     spec = loaded.data  # Get raw dict data for codegen
 
     library = spec.get("library", {})
     format_code = not no_format
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
     skip_maturity = {"implemented", "tested"} if skip_implemented else None
 
     type_module_map = build_type_module_map(spec)
@@ -2570,6 +2885,7 @@ def codegen(
     if output or dry_run:
         output_dir = Path(output) if output else Path(".")
         results: list[GenerationResult] = []
+        package_dirs: dict[str, Path] = {"": output_dir}  # Dotted package -> directory
 
         # Check for circular imports BEFORE generating modules (Issue 5 fix)
         import_graph = build_import_graph(modules, type_module_map)
@@ -2589,8 +2905,7 @@ def codegen(
                         shared_code = format_with_ruff(shared_code)
 
                     shared_module_path = f"{package}._types"
-                    parts = shared_module_path.split(".")
-                    shared_file_path = output_dir / "/".join(parts[:-1]) / f"{parts[-1]}.py"
+                    shared_file_path = _package_dir(package, package_dirs) / "_types.py"
 
                     result = GenerationResult(
                         module=shared_module_path,
@@ -2598,29 +2913,31 @@ def codegen(
                         path=shared_file_path,
                     )
 
-                    if not dry_run:
-                        shared_file_path.parent.mkdir(parents=True, exist_ok=True)
-                        shared_file_path.write_text(shared_code)
-
                     results.append(result)
 
                     # Update type_module_map to point to _types.py
                     for type_name in type_names:
                         type_module_map[type_name] = shared_module_path
 
-        for module_path, content in modules.items():
-            code = generate_module_code(
-                module_path,
-                content,
-                type_module_map=type_module_map,
-                use_pydantic=pydantic,
-                spec=spec,
+        cache_hits = 0
+        if cache_dir:
+            module_codes, cache_hits = generate_modules_cached(
+                modules,
+                type_module_map,
+                pydantic,
+                spec,
+                format_code,
+                Path(cache_dir),
+                jobs,
+                dry_run=dry_run,
             )
-            if format_code:
-                code = format_with_ruff(code)
-
-            parts = module_path.split(".")
-            file_path = output_dir / "/".join(parts[:-1]) / f"{parts[-1]}.py"
+        else:
+            module_codes = generate_modules(
+                modules, type_module_map, pydantic, spec, format_code, jobs
+            )
+        for module_path, code in zip(modules, module_codes):
+            package, _, name = module_path.rpartition(".")
+            file_path = _package_dir(package, package_dirs) / f"{name}.py"
 
             result = GenerationResult(
                 module=module_path,
@@ -2628,15 +2945,12 @@ def codegen(
                 path=file_path,
             )
 
-            if not dry_run:
-                file_path.parent.mkdir(parents=True, exist_ok=True)
-                file_path.write_text(code)
-
             results.append(result)
 
         # Generate __init__.py files
         spec_modules = library.get("modules", [])
         export_warnings: list[str] = []
+        init_files: list[tuple[str, Path, str]] = []  # (module, path, code)
         for mod_info in spec_modules:
             exports = mod_info.get("exports", [])
             mod_path = mod_info.get("path", "")
@@ -2672,55 +2986,59 @@ def codegen(
                 else:
                     init_code = f'"""Package {mod_path}."""\n'
 
-            if format_code:
-                init_code = format_with_ruff(init_code)
+            init_file_path = _package_dir(mod_path, package_dirs) / "__init__.py"
+            init_files.append((f"{mod_path}.__init__", init_file_path, init_code))
 
-            parts = mod_path.split(".")
-            init_file_path = output_dir / "/".join(parts) / "__init__.py"
+        # Format all __init__.py files in one ruff run
+        init_codes = [init_code for _, _, init_code in init_files]
+        if format_code:
+            init_codes = format_all_with_ruff(init_codes)
 
+        for (init_module, init_file_path, _), init_code in zip(init_files, init_codes):
             result = GenerationResult(
-                module=f"{mod_path}.__init__",
+                module=init_module,
                 code=init_code,
                 path=init_file_path,
             )
 
-            if not dry_run:
-                init_file_path.parent.mkdir(parents=True, exist_ok=True)
-                init_file_path.write_text(init_code)
-
             results.append(result)
 
+        if not dry_run:
+            _write_generated_files(results)
+
         # Re-check for circular imports after _types.py generation
         # This shows any remaining cycles that couldn't be resolved
         final_import_graph = build_import_graph(modules, type_module_map)
         remaining_cycles = find_import_cycles(final_import_graph)
 
         # Output warnings
-        all_warnings: list[str] = []
-        all_warnings.extend(export_warnings)
-        for cycle in remaining_cycles:
-            cycle_path = " → ".join(cycle)
-            all_warnings.append(f"Remaining circular import (may need manual resolution): {cycle_path}")
-
-        if all_warnings:
+        if export_warnings or remaining_cycles:
             click.secho("\nWarnings:", fg="yellow")
-            for warning in all_warnings:
+            for warning in export_warnings:
                 click.secho(f"  • {warning}", fg="yellow")
+            for cycle in remaining_cycles:
+                cycle_path = " → ".join(cycle)
+                click.secho(
+                    f"  • Remaining circular import (may need manual resolution): {cycle_path}",
+                    fg="yellow",
+                )
 
-        # Output results
+        # Output results, collected into one echo so large runs don't write per line
+        report: list[str] = []
         if dry_run:
             total_lines = 0
             for result in results:
-                line_count = result.code.count('\n') + 1
-                total_lines += line_count
-                click.echo(f"# --- {result.path} ({line_count} lines) ---")
-                click.echo(result.code)
-                click.echo()
-            click.echo(f"# Would generate {len(results)} files ({total_lines} lines)")
+                total_lines += result.line_count
+                report.append(
+                    f"# --- {result.path} ({result.line_count} lines) ---\n{result.code}\n"
+                )
+            report.append(f"# Would generate {len(results)} files ({total_lines} lines)")
         else:
-            for result in results:
-                click.echo(f"Generated: {result.path}")
-            click.echo(f"\n{len(results)} files generated")
+            report.extend(f"Generated: {result.path}" for result in results)
+            report.append(f"\n{len(results)} files generated")
+        click.echo("\n".join(report))
+        if cache_dir:
+            click.echo(f"{cache_hits}/{len(modules)} modules reused from cache")
         return
 
     # Default: list modules
@@ -1,7 +1,9 @@
 """Configuration loading from pyproject.toml."""
 
 import sys
+from functools import lru_cache
 from pathlib import Path
+from typing import Any
 
 from pydantic import BaseModel, Field
 
@@ -71,13 +73,25 @@ class LibspecConfig(BaseModel):
         if config_path is None or not config_path.exists():
             return cls()
 
-        with open(config_path, "rb") as f:
-            data = tomllib.load(f)
-
-        tool_config = data.get("tool", {}).get("libspec", {})
+        tool_config = _read_tool_config(str(config_path.resolve()), config_path.stat().st_mtime_ns)
         return cls.model_validate(tool_config)
 
 
+@lru_cache(maxsize=8)
+def _read_tool_config(path: str, mtime_ns: int) -> dict[str, Any]:
+    """
+    Read the [tool.libspec] table from a pyproject.toml file.
+
+    Cached on (path, mtime) so repeated loads in one process only re-parse
+    the file after it changes. Callers must not mutate the returned dict.
+    """
+    with open(path, "rb") as f:
+        data = tomllib.load(f)
+
+    tool_config: dict[str, Any] = data.get("tool", {}).get("libspec", {})
+    return tool_config
+
+
 def find_pyproject() -> Path | None:
     """Find pyproject.toml by walking up from cwd."""
     cwd = Path.cwd()
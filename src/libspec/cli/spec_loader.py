@@ -9,6 +9,7 @@ from typing import Any, Dict, Set
 
 from pydantic import BaseModel, ConfigDict, ValidationError
 
+from libspec import _load_json
 from libspec.models import (
     AsyncFunctionFields,
     AsyncMethodFields,
@@ -574,8 +575,7 @@ def load_spec(path: Path, *, validate: bool = True, strict: bool = False) -> Loa
         raise SpecLoadError(f"Spec file not found: {path}")
 
     try:
-        with open(path) as f:
-            data = json.load(f)
+        data = _load_json(path)
     except json.JSONDecodeError as e:
         raise SpecLoadError(f"Invalid JSON in {path}: {e}")
     except OSError as e:
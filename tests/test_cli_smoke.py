@@ -49,3 +49,34 @@ def test_refs_nested_method_text():
     spec = str(FIXTURES / "http-client.json")
     result = run_cmd(["--spec", spec, "--text", "refs", "#/types/Request/methods/with_headers"])
     assert "with_headers" in result.output
+
+
+def test_coverage_counts_and_gaps():
+    """Coverage reports feature status counts and feature gaps."""
+    spec = str(FIXTURES / "http-client.json")
+    result = run_cmd(["--spec", spec, "coverage"])
+    data = json.loads(result.output)["result"]
+    features = data["features"]
+    assert (features["planned"], features["implemented"], features["tested"]) == (4, 2, 2)
+    assert data["documentation"]["methods_total"] == 27
+    assert len(data["gaps"]) == 6
+    assert {g["issue"] for g in data["gaps"]} == {"not implemented", "not tested"}
+
+
+def test_deps_type_filters_to_spec_types():
+    """deps only reports references to types defined in the spec."""
+    spec = str(FIXTURES / "http-client.json")
+    result = run_cmd(["--spec", spec, "deps", "--type", "Request"])
+    data = json.loads(result.output)["result"]
+    assert sorted(data["depends_on"]) == ["Headers", "URL"]
+
+
+def test_surface_by_module_totals_match():
+    """Per-module surface counts add up to the overall totals."""
+    spec = str(FIXTURES / "http-client.json")
+    result = run_cmd(["--spec", spec, "surface", "--by-module"])
+    data = json.loads(result.output)["result"]
+    by_module = data["by_module"]
+    assert sum(m["types"] for m in by_module.values()) == data["public_types"] == 16
+    assert sum(m["functions"] for m in by_module.values()) == data["public_functions"] == 4
+    assert sum(m["methods"] for m in by_module.values()) == data["total_methods"]
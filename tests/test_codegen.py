@@ -0,0 +1,364 @@
+"""Tests for the codegen command's stub generation helpers."""
+
+import ast
+import os
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from libspec.cli import cli
+from libspec.cli.commands.codegen import (
+    ModuleContent,
+    collect_imports,
+    find_import_cycles,
+    format_all_with_ruff,
+    format_with_ruff,
+    generate_dataclass_ast,
+    generate_decorator_ast,
+    generate_module_code,
+    generate_type_var_ast,
+    make_type_annotation,
+    normalize_type,
+    parse_signature,
+    render_function_docstring,
+)
+
+
+class TestNormalizeType:
+    """Test conversion of typing aliases to modern syntax."""
+
+    def test_typing_aliases_become_builtins(self) -> None:
+        """List/Dict/Tuple/Set/FrozenSet are lowered, nested or not."""
+        assert (
+            normalize_type("Dict[str, List[Tuple[Set[int], FrozenSet[str]]]]")
+            == "dict[str, list[tuple[set[int], frozenset[str]]]]"
+        )
+
+    def test_nested_optional(self) -> None:
+        """Optional is rewritten with balanced brackets, including nesting."""
+        assert normalize_type("Optional[Optional[type[Any]]]") == "type[Any] | None | None"
+
+    def test_alias_prefix_is_not_rewritten(self) -> None:
+        """Only whole alias names are lowered."""
+        assert normalize_type("MySet[int]") == "MySet[int]"
+
+    def test_empty_or_null_passes_through(self) -> None:
+        """Missing types are returned unchanged."""
+        assert normalize_type("") == ""
+        assert normalize_type(None) is None  # type: ignore[arg-type]
+
+
+class TestParseSignature:
+    """Test signature string parsing."""
+
+    def test_params_and_return_type(self) -> None:
+        """Parameters keep their normalized hints and defaults."""
+        sig = parse_signature("(x: Optional[int] = None, y: Dict[str, int] = {}) -> List[str]")
+        assert [(p.name, p.type_hint, p.default) for p in sig.params] == [
+            ("x", "int | None", "None"),
+            ("y", "dict[str, int]", "{}"),
+        ]
+        assert sig.returns == "list[str]"
+
+    def test_returned_signatures_are_independent(self) -> None:
+        """Mutating a parsed signature does not affect later parses of the same string."""
+        first = parse_signature("(self, x: int) -> None")
+        first.params[1].type_hint = "str"
+        first.params.clear()
+        second = parse_signature("(self, x: int) -> None")
+        assert [(p.name, p.type_hint) for p in second.params] == [("self", None), ("x", "int")]
+
+
+class TestMakeTypeAnnotation:
+    """Test annotation node construction."""
+
+    def test_matches_parser_output(self) -> None:
+        """Fast-pathed names build the same nodes the parser would."""
+        for source in ("int", "None", "os.PathLike", "list[str]", "A | None", "a.b[c]"):
+            expected = ast.dump(ast.parse(source, mode="eval").body)
+            assert ast.dump(make_type_annotation(source)) == expected
+
+    def test_invalid_annotation_becomes_string(self) -> None:
+        """Unparseable annotations are kept as string constants."""
+        node = make_type_annotation("list[")
+        assert isinstance(node, ast.Constant)
+        assert node.value == "list["
+
+
+class TestDecorators:
+    """Test decorator node generation."""
+
+    def test_decorator_forms(self) -> None:
+        """Names, dotted names and DecoratorSpec dicts render as written."""
+        cases = [
+            ("property", "property"),
+            ("mcp.tool", "mcp.tool"),
+            ({"name": "cache"}, "cache()"),
+            ({"name": "wraps", "call": False}, "wraps"),
+            (
+                {"name": "app.route", "args": ["'/'"], "kwargs": {"methods": "['GET']"}},
+                "app.route('/', methods=['GET'])",
+            ),
+        ]
+        for decorator, expected in cases:
+            assert ast.unparse(generate_decorator_ast(decorator)) == expected
+
+
+class TestTypeVars:
+    """Test TypeVar definition generation."""
+
+    def test_cached_type_var_still_warns_and_renames(self, capsys) -> None:
+        """Repeated TypeVars are built once but report the rename every time."""
+        param = {"name": "T", "variance": "covariant", "bound": "Base"}
+        first, first_renames = generate_type_var_ast(param)
+        second, second_renames = generate_type_var_ast(dict(param))
+        assert ast.unparse(first.value) == "TypeVar('T_co', bound=Base, covariant=True)"
+        assert ast.dump(second) == ast.dump(first)
+        assert first_renames == second_renames == {"T": "T_co"}
+        assert capsys.readouterr().err.count("renamed to 'T_co'") == 2
+
+    def test_returned_type_var_can_be_mutated(self) -> None:
+        """Changing a returned node does not leak into later modules."""
+        param = {"name": "K"}
+        node, _ = generate_type_var_ast(param)
+        node.targets[0].id = "Changed"
+        code = generate_module_code(
+            "pkg.mod",
+            ModuleContent(
+                functions=[{"name": "f", "signature": "(k: K) -> K", "generic_params": [param]}]
+            ),
+        )
+        assert "K = TypeVar('K')" in code
+        assert ast.unparse(generate_type_var_ast(param)[0]) == "K = TypeVar('K')"
+
+
+class TestCollectImports:
+    """Test import collection for generated modules."""
+
+    def test_stdlib_types_in_signatures_are_type_only(self) -> None:
+        """Stdlib names found in annotations go in the TYPE_CHECKING block."""
+        content = ModuleContent(
+            functions=[{"name": "f", "signature": "(when: datetime, p: Path) -> date"}]
+        )
+        imports = collect_imports(content)
+        assert "from datetime import datetime" in imports.type_only
+        assert "from datetime import date" in imports.type_only
+        assert "from pathlib import Path" in imports.type_only
+
+    def test_stdlib_names_match_whole_words_only(self) -> None:
+        """A stdlib name embedded in a longer identifier is not imported."""
+        content = ModuleContent(
+            functions=[{"name": "f", "signature": "(update: Pathish) -> Sequences"}]
+        )
+        assert collect_imports(content).type_only == []
+
+    def test_stdlib_base_class_is_runtime_import(self) -> None:
+        """A stdlib base class needs its import at runtime."""
+        content = ModuleContent(types=[{"name": "Walker", "kind": "class", "bases": ["Iterator"]}])
+        imports = collect_imports(content)
+        assert "from collections.abc import Iterator" in imports.runtime
+
+
+class TestFindImportCycles:
+    """Test cycle detection in the module import graph."""
+
+    def test_cycles_are_normalized_and_deduplicated(self) -> None:
+        """Each cycle is reported once, starting from its smallest module."""
+        graph = {"b": {"c"}, "c": {"a"}, "a": {"b"}, "d": {"d"}}
+        assert find_import_cycles(graph) == [["a", "b", "c", "a"], ["d", "d"]]
+
+    def test_overlapping_cycles_are_reported_once(self) -> None:
+        """Cycles sharing modules are merged into a single report."""
+        graph = {"a": {"b"}, "b": {"a", "c"}, "c": {"b"}, "e": {"a"}}
+        [cycle] = find_import_cycles(graph)
+        assert cycle[0] == cycle[-1] == "a"
+        assert sorted(cycle[:-1]) == ["a", "b", "c"]
+
+    def test_long_chains_do_not_recurse(self) -> None:
+        """Import chains deeper than the recursion limit are handled."""
+        n = 5000
+        graph = {f"m{i}": {f"m{(i + 1) % n}"} for i in range(n)}
+        [cycle] = find_import_cycles(graph)
+        assert len(cycle) == n + 1
+
+
+class TestDataclassDefaults:
+    """Test default values on generated dataclass fields."""
+
+    def _fields(self, properties: list[dict]) -> list[str]:
+        typ = {"name": "Config", "kind": "dataclass", "properties": properties}
+        body = generate_dataclass_ast(typ).body[1:]
+        return [ast.unparse(node) for node in body]
+
+    def test_mutable_defaults_use_factories(self) -> None:
+        """Mutable defaults become default_factory lambdas of the right kind."""
+        assert self._fields(
+            [
+                {"name": "a", "type": "list[int]", "default": "[1]"},
+                {"name": "b", "type": "dict[str, int]", "default": "{}"},
+                {"name": "c", "type": "set[str]", "default": "{}"},
+                {"name": "d", "type": "frozenset[str]", "default": "{}"},
+                {"name": "e", "type": "Helper", "default": "Helper()"},
+            ]
+        ) == [
+            "a: list[int] = field(default_factory=lambda: [])",
+            "b: dict[str, int] = field(default_factory=lambda: {})",
+            "c: set[str] = field(default_factory=lambda: set())",
+            "d: frozenset[str] = field(default_factory=lambda: frozenset())",
+            "e: Helper = field(default_factory=lambda: Helper())",
+        ]
+
+    def test_immutable_defaults_are_inlined(self) -> None:
+        """Plain values and calls with arguments are used as-is."""
+        assert self._fields(
+            [
+                {"name": "a", "type": "int", "default": "0"},
+                {"name": "b", "type": "Helper", "default": "Helper(1)"},
+                {"name": "c", "type": "str"},
+            ]
+        ) == ["a: int = 0", "b: Helper = Helper(1)", "c: str"]
+
+
+class TestRenderDocstrings:
+    """Test docstring rendering from spec entries."""
+
+    def test_function_sections(self) -> None:
+        """Sections appear in order, separated by blank lines."""
+        func = {
+            "description": "Connect.",
+            "parameters": [
+                {"name": "host", "description": "Host name"},
+                {"name": "timeout", "kind": "keyword_only", "default": "30"},
+            ],
+            "returns": {"type": "Conn", "description": "The connection"},
+            "raises": [{"type": "OSError", "when": "unreachable"}],
+            "pure": True,
+        }
+        assert render_function_docstring(func) == (
+            "Connect.\n"
+            "\n"
+            "Args:\n"
+            "    host: Host name\n"
+            "    timeout (keyword-only):  (default: 30)\n"
+            "\n"
+            "Returns:\n"
+            "    The connection\n"
+            "\n"
+            "Raises:\n"
+            "    OSError: unreachable\n"
+            "\n"
+            "Note:\n"
+            "    This function is pure (no side effects)."
+        )
+
+    def test_null_returns_description_does_not_crash(self) -> None:
+        """A null returns description renders as it did before sections were joined."""
+        func = {"description": "Count.", "returns": {"type": "int", "description": None}}
+        assert render_function_docstring(func) == "Count.\n\nReturns:\n    None"
+
+    def test_description_only(self) -> None:
+        """A bare description renders as-is."""
+        assert render_function_docstring({"description": "Do it."}) == "Do it."
+
+
+def test_module_docstring_keeps_description_text() -> None:
+    """Backslashes and quotes in a module description survive into the docstring."""
+    description = r"Paths like C:\tmp and '''quotes'''"
+    spec = {"library": {"modules": [{"path": "pkg.mod", "description": description}]}}
+    content = ModuleContent(functions=[{"name": "f", "signature": "() -> None"}])
+    code = generate_module_code("pkg.mod", content, spec=spec)
+    docstring = ast.get_docstring(ast.parse(code))
+    assert docstring is not None
+    assert description in docstring
+
+
+def test_docstring_only_class_has_no_placeholder() -> None:
+    """A class with nothing but a docstring is emitted without pass or a stray blank line."""
+    content = ModuleContent(types=[{"name": "Marker", "kind": "class", "docstring": "A marker."}])
+    code = generate_module_code("pkg.mod", content)
+    assert code.endswith('class Marker:\n    """A marker."""')
+    ast.parse(code)
+
+
+def test_batch_formatting_matches_per_file() -> None:
+    """One ruff run formats each file as a separate run would, broken files included."""
+    # The 95-column call only stays on one line under the project's line-length
+    long_call = "result = some_function(" + ", ".join(f"arg{i}" for i in range(12)) + ")\n"
+    codes = [
+        "x  =  1\n",
+        "def f( a ):\n  return a\n",
+        "def broken(:\n",
+        "x  =  1\n",
+        long_call,
+    ]
+    assert format_all_with_ruff(codes) == [format_with_ruff(code) for code in codes]
+    assert format_all_with_ruff(codes)[-1] == long_call
+
+
+def test_parallel_generation_matches_serial() -> None:
+    """Generating with worker processes produces the same files in the same order."""
+    spec = str(Path("docs/examples/http-client.json"))
+    runner = CliRunner()
+    serial = runner.invoke(cli, ["--spec", spec, "codegen", "--dry-run", "--no-format"])
+    parallel = runner.invoke(
+        cli, ["--spec", spec, "codegen", "--dry-run", "--no-format", "--jobs", "2"]
+    )
+    assert serial.exit_code == 0, serial.output
+    assert parallel.exit_code == 0, parallel.output
+    assert parallel.output == serial.output
+
+
+def test_cache_dir_reuses_unchanged_modules(tmp_path: Path) -> None:
+    """A second run with the same cache serves every module from it."""
+    spec = str(Path("docs/examples/http-client.json"))
+    args = ["--spec", spec, "codegen", "--no-format"]
+    cache = ["--cache-dir", str(tmp_path / "cache")]
+    out = ["-o", str(tmp_path / "out")]
+    runner = CliRunner()
+    cold = runner.invoke(cli, [*args, *out, *cache])
+    warm = runner.invoke(cli, [*args, *out, *cache])
+    assert cold.exit_code == 0, cold.output
+    assert warm.exit_code == 0, warm.output
+    assert cold.output.endswith("\n0/6 modules reused from cache\n")
+    assert warm.output == cold.output.replace("\n0/6 ", "\n6/6 ")
+
+    plain = runner.invoke(cli, [*args, "--dry-run"])
+    cached = runner.invoke(cli, [*args, "--dry-run", *cache])
+    assert cached.exit_code == 0, cached.output
+    assert cached.output == plain.output + "6/6 modules reused from cache\n"
+
+
+def test_dry_run_does_not_write_cache(tmp_path: Path) -> None:
+    """A dry run with --cache-dir leaves the cache directory untouched."""
+    spec = str(Path("docs/examples/http-client.json"))
+    cache_dir = tmp_path / "cache"
+    args = ["--spec", spec, "codegen", "--dry-run", "--no-format", "--cache-dir", str(cache_dir)]
+    runner = CliRunner()
+    first = runner.invoke(cli, args)
+    second = runner.invoke(cli, args)
+    assert first.exit_code == 0, first.output
+    assert not cache_dir.exists()
+    assert second.output == first.output
+
+
+def test_unchanged_files_are_not_rewritten(tmp_path: Path) -> None:
+    """Regenerating into the same directory leaves identical files untouched."""
+    spec = str(Path("docs/examples/http-client.json"))
+    args = ["--spec", spec, "codegen", "--no-format", "-o", str(tmp_path)]
+    runner = CliRunner()
+    assert runner.invoke(cli, args).exit_code == 0
+    files = sorted(tmp_path.rglob("*.py"))
+    for path in files:
+        os.utime(path, ns=(0, 0))
+    assert runner.invoke(cli, args).exit_code == 0
+    assert [path.stat().st_mtime_ns for path in files] == [0] * len(files)
+
+
+def test_cache_key_tracks_generator_source(monkeypatch) -> None:
+    """Changing codegen itself invalidates cached modules."""
+    from libspec.cli.commands import codegen
+
+    args = ("pkg.mod", ModuleContent(), {}, False, {}, False)
+    before = codegen._module_cache_key(*args)
+    monkeypatch.setattr(codegen, "_generator_fingerprint", lambda: "changed")
+    assert codegen._module_cache_key(*args) != before
@@ -0,0 +1,46 @@
+"""Tests for [tool.libspec] config loading."""
+
+import os
+from pathlib import Path
+
+import click
+import pytest
+
+from libspec.cli.app import Context
+from libspec.cli.config import LibspecConfig
+
+
+def _write_config(path: Path, spec_path: str, mtime_ns: int) -> None:
+    path.write_text(f'[tool.libspec]\nspec_path = "{spec_path}"\n')
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_config_reloaded_after_change(tmp_path: Path) -> None:
+    """Cached config is re-read once pyproject.toml changes."""
+    pyproject = tmp_path / "pyproject.toml"
+    _write_config(pyproject, "a.json", 1_000_000_000)
+    assert LibspecConfig.load(pyproject).spec_path == "a.json"
+
+    _write_config(pyproject, "b.json", 2_000_000_000)
+    assert LibspecConfig.load(pyproject).spec_path == "b.json"
+
+
+def test_config_instances_are_independent(tmp_path: Path) -> None:
+    """Each load returns a fresh model even when the file is cached."""
+    pyproject = tmp_path / "pyproject.toml"
+    _write_config(pyproject, "a.json", 1_000_000_000)
+    first = LibspecConfig.load(pyproject)
+    first.lint.disable.append("S001")
+    assert LibspecConfig.load(pyproject).lint.disable == []
+
+
+def test_missing_spec_after_discovery_is_click_error(tmp_path: Path) -> None:
+    """A spec removed after it was found is reported without a traceback."""
+    spec = tmp_path / "libspec.json"
+    spec.write_text('{"library": {"name": "lib", "version": "1.0.0"}}')
+    ctx = Context(str(spec), False, False, LibspecConfig(), False)
+    ctx.get_spec()
+
+    spec.unlink()
+    with pytest.raises(click.ClickException, match="Spec file not found"):
+        ctx.get_spec()
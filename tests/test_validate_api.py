@@ -19,8 +19,10 @@ from libspec import (
     ValidationIssue,
     ValidationSeverity,
     get_extension_schema,
+    is_valid_spec,
     merge_schemas,
     validate_spec,
+    validate_specs,
 )
 
 
@@ -126,6 +128,16 @@ class TestMergeSchemas:
         assert warnings == []
         assert "$defs" in merged
 
+    def test_merge_does_not_mutate_core(self) -> None:
+        """Merging extensions leaves the core schema's $defs untouched."""
+        from libspec import get_core_schema
+
+        core = get_core_schema()
+        core_defs = set(core["$defs"])
+        merged, _ = merge_schemas(core, ["async", "web"])
+        assert set(core["$defs"]) == core_defs
+        assert len(merged["$defs"]) > len(core_defs)
+
 
 class TestValidateSpec:
     """Test validate_spec function."""
@@ -218,9 +230,117 @@ class TestValidateSpec:
         assert len(warnings) == 1
         assert "Unknown extension" in warnings[0].message
 
+    def test_null_extensions_reported_as_issue(self, tmp_path: Path) -> None:
+        """A null extensions field is a schema error, not a crash."""
+        spec = {
+            "$schema": "libspec/1.0",
+            "extensions": None,
+            "library": {
+                "name": "testlib",
+                "version": "1.0.0",
+            },
+        }
+        spec_path = tmp_path / "null_ext.json"
+        spec_path.write_text(json.dumps(spec))
+
+        errors = validate_spec(spec_path)
+        assert any("None is not of type 'array'" in e for e in errors)
+        assert is_valid_spec(spec_path) is False
+        results = list(validate_specs([spec_path]))
+        assert results[0][1] == validate_spec(spec_path, structured=True)
+
+    def test_skip_pydantic_keeps_schema_errors(self, invalid_spec_file: Path) -> None:
+        """skip_pydantic still reports JSON Schema errors."""
+        assert validate_spec(invalid_spec_file, skip_pydantic=True) == validate_spec(
+            invalid_spec_file
+        )
+
+    def test_is_valid_spec(self, valid_spec_file: Path, invalid_spec_file: Path) -> None:
+        """is_valid_spec agrees with validate_spec on pass/fail."""
+        assert is_valid_spec(valid_spec_file) is True
+        assert is_valid_spec(invalid_spec_file) is False
+
+    def test_validate_specs_batch(self, valid_spec_file: Path, invalid_spec_file: Path) -> None:
+        """validate_specs yields per-file issues matching validate_spec."""
+        results = list(validate_specs([valid_spec_file, invalid_spec_file]))
+        assert [path for path, _ in results] == [valid_spec_file, invalid_spec_file]
+        assert results[0][1] == []
+        assert results[1][1] == validate_spec(invalid_spec_file, structured=True)
+
+    def test_validate_without_orjson(
+        self, valid_spec_file: Path, invalid_spec_file: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Spec loading falls back to the stdlib json module."""
+        import libspec
+
+        monkeypatch.setattr(libspec, "orjson", None)
+        assert validate_spec(valid_spec_file) == []
+        assert len(validate_spec(invalid_spec_file)) > 0
+
     def test_validate_structured_includes_path(self, invalid_spec_file: Path) -> None:
         """Structured issues include JSON path."""
         issues = validate_spec(invalid_spec_file, structured=True)
         # At least one issue should have a meaningful path
         paths = [i.path for i in issues]
         assert any(p != "$" for p in paths) or len(issues) > 0
+
+
+class TestSchemaCaching:
+    """Test that schemas and validators are reused across calls."""
+
+    def test_public_schemas_are_independent_copies(self, tmp_path: Path) -> None:
+        """Mutating a returned schema does not affect later calls or validation."""
+        from libspec import get_core_schema
+
+        core = get_core_schema()
+        assert core == get_core_schema()
+        core["$defs"].clear()
+        assert get_core_schema()["$defs"]
+
+        ext = get_extension_schema("async")
+        ext["$defs"].clear()
+        assert get_extension_schema("async")["$defs"]
+
+        spec_path = tmp_path / "spec.json"
+        spec_path.write_text(json.dumps({"library": {"name": "lib", "version": "1.0.0"}}))
+        assert validate_spec(spec_path) == []
+
+    def test_schema_path_cached_and_missing_raises(self) -> None:
+        """get_schema_path reuses resolved paths and still rejects unknown names."""
+        from libspec import get_schema_path
+
+        assert get_schema_path() is get_schema_path("core.schema.json")
+        with pytest.raises(FileNotFoundError):
+            get_schema_path("missing.schema.json")
+
+    def test_validator_reused_across_calls(self, tmp_path: Path) -> None:
+        """Validating specs with the same extensions reuses one validator."""
+        from libspec import _VALIDATOR_CACHE
+
+        spec = {
+            "$schema": "libspec/1.0",
+            "extensions": ["perf", "safety"],
+            "library": {"name": "testlib", "version": "1.0.0"},
+        }
+        spec_path = tmp_path / "cached.json"
+        spec_path.write_text(json.dumps(spec))
+
+        assert validate_spec(spec_path) == []
+        validator = _VALIDATOR_CACHE[("perf", "safety")][0]
+        assert validate_spec(spec_path) == []
+        assert _VALIDATOR_CACHE[("perf", "safety")][0] is validator
+
+    def test_cached_merge_warnings_repeat(self, tmp_path: Path) -> None:
+        """Merge warnings are reported on every call, not only the first."""
+        spec = {
+            "$schema": "libspec/1.0",
+            "extensions": ["bogus_ext"],
+            "library": {"name": "testlib", "version": "1.0.0"},
+        }
+        spec_path = tmp_path / "bogus.json"
+        spec_path.write_text(json.dumps(spec))
+
+        for _ in range(2):
+            issues = validate_spec(spec_path, structured=True)
+            warnings = [i for i in issues if i.severity == ValidationSeverity.WARNING]
+            assert [w.message for w in warnings] == ["Unknown extension: 'bogus_ext'"]